@@ -14,18 +14,42 @@ CACHE_TTL = 3600  # 1 hour
 TABLE_HIGHS = "highs"
 TABLE_FIVETOFIFTYCLUB = "fivetofiftyclub"
 TABLE_DOWNFROMHIGH = "downfromhigh"
+TABLE_COMPANY_FIRST_SEEN = "company_first_seen"
+TABLE_SCHEMA_MANIFEST = "schema_manifest"
+TABLE_COMPANIES = "companies"
+TABLE_INDUSTRIES = "industries"
+TABLE_WEEKLY_PERIODS = "weekly_periods"
+TABLE_WEEKLY_COMPANY_STATS = "weekly_company_stats"
+TABLE_WEEKLY_INDUSTRY_STATS = "weekly_industry_stats"
 
 # Screener.in configuration
+# Where the exporter and screener_fetch send requests; point it at a local
+# stub (etl/screener_stub.py) to run them offline.
+SCREENER_BASE_URL = os.getenv("SCREENER_BASE_URL", "https://www.screener.in").rstrip("/")
 SCREENER_URL_TEMPLATE = "https://www.screener.in/company/{code}/"
 
+# On-disk cache of screener_fetch results (company pages and searches)
+SCREENER_CACHE_DB = str(_BASE / "screener_cache.db")
+SCREENER_CACHE_TTL = 24 * 3600             # served without refetching for a day
+SCREENER_CACHE_MAX_STALE = 30 * 24 * 3600  # older entries are refetched before use
+SCREENER_CACHE_MAX_ENTRIES = 5000          # least recently read entries are evicted
+
+# screener_fetch request pacing, shared by every app session and thread
+SCREENER_FETCH_RATE = 1.0   # requests per second (0 disables throttling)
+SCREENER_FETCH_BURST = 1    # requests allowed back to back after an idle spell
+
 # Data processing configuration
 INVALID_CODES = {"", "NA", "<NA>", "<N/A>", "N/A", "NONE", "NAN"}
 STANDARD_COLUMNS = ["bse_code", "nse_code", "industry", "name"]
+# pandas dtypes the app's loaders give these columns (db_utils._apply_standard_types).
+# SQL_COLUMN_TYPES below is the separate SQLite declaration the ETL writes with.
 COLUMN_TYPES = {
     "bse_code": "Int64",
     "nse_code": "string",
     "industry": "string",
     "name": "string",
+    "industry_group": "string",
+    "isin_code": "string",
 }
 
 # Chart configuration
@@ -40,9 +64,19 @@ ROLLING_WINDOWS = [7, 30, 60]
 # Directory paths
 DOWNLOAD_DIR = _BASE / "screener_downloads"
 ARCHIVE_DIR  = _BASE / "__screener_downloads"
+PARQUET_DIR  = _BASE / "parquet"  # columnar mirror: <table>/<YYYY-MM>.parquet
+
+# Rewritten by the ETL whenever it commits new data; the app clears its
+# cached queries when the contents change.
+DATA_VERSION_FILE = _BASE / "data_version"
+
+# Seconds between folder polls in `etl.py --watch`
+WATCH_INTERVAL = 5
 
 # Logging
 ETL_LOG_FILE    = str(_BASE / "etl.log")
+ETL_STATS_FILE  = str(_BASE / "etl_stats.json")  # per-stage timings of the last run
+ETL_PROF_FILE   = str(_BASE / "etl.prof")        # cProfile dump from `etl.py --profile`
 LOG_FORMAT      = "%(asctime)s [%(levelname)s] %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
@@ -50,6 +84,9 @@ LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 SCREENER_USERNAME = os.getenv("SCREENER_USERNAME", "")
 SCREENER_PASSWORD = os.getenv("SCREENER_PASSWORD", "")
 
+# Logged-in Screener.in cookies reused across exporter runs (owner-only, gitignored)
+SCREENER_SESSION_FILE = _BASE / ".screener_session.json"
+
 # Column aliases — normalise varied Screener.in CSV headers to consistent DB names
 COLUMN_ALIASES = {
     "price_to_earning": "pe",
@@ -74,6 +111,44 @@ COLUMN_ALIASES = {
     "down_from_52w_high": "down_from_52w_high",
 }
 
+# Declared SQLite type of each DB column loaded from the CSVs (after aliasing).
+# The ETL coerces REAL/INTEGER columns with pd.to_numeric, so unparseable
+# values become NULL; columns not listed are typed from the first CSV they
+# appear in.
+SQL_COLUMN_TYPES = {
+    "industry": "TEXT",
+    "industry_group": "TEXT",
+    "nse_code": "TEXT",
+    "isin_code": "TEXT",
+    "bse_code": "INTEGER",
+    "current_price": "REAL",
+    "market_cap": "REAL",
+    "sales": "REAL",
+    "operating_profit": "REAL",
+    "opm": "REAL",
+    "opm_last_year": "REAL",
+    "pe": "REAL",
+    "pbv": "REAL",
+    "peg": "REAL",
+    "roa": "REAL",
+    "roe": "REAL",
+    "debt_to_equity": "REAL",
+    "debt_to_ebit": "REAL",
+    "working_capital": "REAL",
+    "cash_equivalents": "REAL",
+    "face_value": "REAL",
+    "dividend_yield": "REAL",
+    "earnings_yield": "REAL",
+    "other_income": "REAL",
+    "down_from_52w_high": "REAL",
+    "trade_receivables": "REAL",
+    "trade_payables": "REAL",
+    "inventory": "REAL",
+    "change_in_dii_holding": "REAL",
+    "change_in_fii_holding": "REAL",
+    "rsi": "REAL",
+}
+
 # ETL jobs — one per Screener screen
 ETL_JOBS = [
     {"subfolder": "52weekhigh",  "table": TABLE_HIGHS,          "processed": "processed_files"},
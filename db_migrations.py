@@ -0,0 +1,532 @@
+"""
+db_migrations.py
+
+Versioned schema migrations for highs.db.
+
+The applied version is stored in SQLite's PRAGMA user_version. Every step is
+written to be idempotent (IF NOT EXISTS, INSERT OR IGNORE) so it is safe on
+databases that predate versioning. apply_migrations() is called by both the
+ETL and app startup; an up-to-date database costs a single PRAGMA read.
+
+Add a schema change by appending a function to MIGRATIONS — never edit or
+reorder steps that have already shipped.
+"""
+
+import sqlite3
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from config import (
+    ETL_JOBS,
+    TABLE_COMPANIES,
+    TABLE_COMPANY_FIRST_SEEN,
+    TABLE_HIGHS,
+    TABLE_INDUSTRIES,
+    SQL_COLUMN_TYPES,
+    TABLE_SCHEMA_MANIFEST,
+    TABLE_WEEKLY_COMPANY_STATS,
+    TABLE_WEEKLY_INDUSTRY_STATS,
+    TABLE_WEEKLY_PERIODS,
+)
+
+FACT_TABLES = [job["table"] for job in ETL_JOBS]
+PROCESSED_TABLES = [job["processed"] for job in ETL_JOBS]
+
+# Text columns stored in the fact tables as integer keys into a dimension:
+# column -> (dimension table, key column).
+DIMENSION_KEYS = {
+    "name": (TABLE_COMPANIES, "company_id"),
+    "industry": (TABLE_INDUSTRIES, "industry_id"),
+}
+
+
+def _table_columns(conn: sqlite3.Connection, table_name: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})").fetchall()}
+
+
+def fact_table(table_name: str) -> str:
+    """Return the physical table behind a fact view, e.g. highs -> highs_fact."""
+    return f"{table_name}_fact"
+
+
+def hits_table(table_name: str) -> str:
+    """Return the cumulative hit-count table for a fact table, e.g. highs -> highs_hits."""
+    return f"{table_name}_hits"
+
+
+def latest_table(table_name: str) -> str:
+    """Return the per-company latest-date table for a fact table, e.g. highs -> highs_latest."""
+    return f"{table_name}_latest"
+
+
+def refresh_fact_view(conn: sqlite3.Connection, table_name: str) -> None:
+    """(Re)create the view that exposes a fact table with its text columns.
+
+    The view keeps the fact table's column order, with company_id and
+    industry_id replaced by the name and industry they stand for. Call it
+    after adding columns to the fact table.
+    """
+    select = []
+    for _, col, *_ in conn.execute(f"PRAGMA table_info({fact_table(table_name)})").fetchall():
+        if col == "company_id":
+            select.append("c.name AS name")
+        elif col == "industry_id":
+            select.append("i.industry AS industry")
+        else:
+            select.append(f"f.{col} AS {col}")
+    conn.execute(f"DROP VIEW IF EXISTS {table_name}")
+    conn.execute(f"""
+        CREATE VIEW {table_name} AS
+        SELECT {', '.join(select)}
+        FROM {fact_table(table_name)} f
+        JOIN {TABLE_COMPANIES} c ON c.company_id = f.company_id
+        LEFT JOIN {TABLE_INDUSTRIES} i ON i.industry_id = f.industry_id
+    """)
+
+
+# ── Index definitions ─────────────────────────────────────────────────────────
+
+def index_statements() -> list[tuple[str, str]]:
+    """Return (index_name, CREATE INDEX statement) for every secondary index.
+
+    These can be dropped for a bulk load and rebuilt afterwards. The unique
+    (date, name) indexes are not listed: upserts need them during the load.
+    """
+    return [
+        (
+            f"idx_{table}_company_date",
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_company_date "
+            f"ON {fact_table(table)} (company_id, date)",
+        )
+        for table in FACT_TABLES
+    ]
+
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    """Create all secondary indexes (no-op for those that already exist)."""
+    for _, statement in index_statements():
+        conn.execute(statement)
+    conn.commit()
+
+
+def rebuild_hits(conn: sqlite3.Connection, table_name: str) -> None:
+    """Recompute a fact table's cumulative hit counts from scratch."""
+    conn.execute(f"DELETE FROM {hits_table(table_name)}")
+    conn.execute(f"""
+        INSERT INTO {hits_table(table_name)} (company_id, date, cum_hits)
+        SELECT company_id, date, ROW_NUMBER() OVER (PARTITION BY company_id ORDER BY date)
+        FROM {fact_table(table_name)}
+    """)
+
+
+def rebuild_latest(conn: sqlite3.Connection, table_name: str) -> None:
+    """Recompute a fact table's per-company latest dates from scratch."""
+    conn.execute(f"DELETE FROM {latest_table(table_name)}")
+    conn.execute(f"""
+        INSERT INTO {latest_table(table_name)} (company_id, date)
+        SELECT company_id, MAX(date) FROM {fact_table(table_name)} GROUP BY company_id
+    """)
+
+
+def refresh_weekly_stats(conn: sqlite3.Connection, day: date | None = None) -> None:
+    """Recompute the weekly report tables from the highs fact table.
+
+    With a day, only the Monday-to-Sunday week containing it is recomputed;
+    without one, every week is. Per company a week records its hit count,
+    first/last dates, the first and last non-null market cap and the latest
+    non-null industry and exchange codes. Industry rows aggregate those with
+    a market-cap-weighted gain, matching compute_industry_tailwind_stats().
+    """
+    if day is None:
+        start, end = "0000-01-01", "9999-12-31"
+    else:
+        monday = day - timedelta(days=day.weekday())
+        start, end = monday.isoformat(), (monday + timedelta(days=7)).isoformat()
+
+    for table in (TABLE_WEEKLY_PERIODS, TABLE_WEEKLY_COMPANY_STATS, TABLE_WEEKLY_INDUSTRY_STATS):
+        conn.execute(f"DELETE FROM {table} WHERE week_start >= ? AND week_start < ?", (start, end))
+
+    fact = fact_table(TABLE_HIGHS)
+    week_start = "date(date, 'weekday 0', '-6 days')"
+    conn.execute(
+        f"""
+        INSERT INTO {TABLE_WEEKLY_PERIODS} (week_start, first_date, last_date, trading_days)
+        SELECT {week_start}, MIN(date), MAX(date), COUNT(DISTINCT date)
+        FROM {fact}
+        WHERE date >= ? AND date < ?
+        GROUP BY 1
+        """,
+        (start, end),
+    )
+
+    existing = _table_columns(conn, fact)
+    values = {
+        "market_cap": "CAST(market_cap AS REAL)" if "market_cap" in existing else "NULL",
+        "industry_id": "industry_id" if "industry_id" in existing else "NULL",
+        "nse_code": "nse_code" if "nse_code" in existing else "NULL",
+        "bse_code": "bse_code" if "bse_code" in existing else "NULL",
+    }
+    ranks = {
+        f"{col}_{edge}": f"ROW_NUMBER() OVER (w ORDER BY {col} IS NULL, date{order})"
+        for col in values
+        for edge, order in (("first", ""), ("last", " DESC"))
+    }
+    conn.execute(
+        f"""
+        INSERT INTO {TABLE_WEEKLY_COMPANY_STATS} (
+            week_start, company_id, hits, first_seen_in_week, last_seen_in_week,
+            market_cap_start, market_cap_end, industry_id, nse_code, bse_code
+        )
+        SELECT week_start, company_id, COUNT(*), MIN(date), MAX(date),
+               MAX(CASE WHEN market_cap_first = 1 THEN market_cap END),
+               MAX(CASE WHEN market_cap_last = 1 THEN market_cap END),
+               MAX(CASE WHEN industry_id_last = 1 THEN industry_id END),
+               MAX(CASE WHEN nse_code_last = 1 THEN nse_code END),
+               MAX(CASE WHEN bse_code_last = 1 THEN bse_code END)
+        FROM (
+            SELECT {week_start} AS week_start, company_id, date, {', '.join(values)},
+                   {', '.join(f"{expr} AS {name}" for name, expr in ranks.items())}
+            FROM (
+                SELECT date, company_id,
+                       {', '.join(f"{expr} AS {col}" for col, expr in values.items())}
+                FROM {fact}
+                WHERE date >= ? AND date < ?
+            )
+            WINDOW w AS (PARTITION BY {week_start}, company_id)
+        )
+        GROUP BY week_start, company_id
+        """,
+        (start, end),
+    )
+
+    conn.execute(
+        f"""
+        INSERT INTO {TABLE_WEEKLY_INDUSTRY_STATS} (
+            week_start, industry_id, count_stocks, total_hits, avg_hits, weighted_gain_mc
+        )
+        SELECT week_start, industry_id, COUNT(*), SUM(hits), AVG(hits),
+               SUM(CASE WHEN gain IS NOT NULL AND market_cap_end > 0 THEN gain * market_cap_end END)
+               / SUM(CASE WHEN gain IS NOT NULL AND market_cap_end > 0 THEN market_cap_end END)
+        FROM (
+            SELECT week_start, industry_id, hits, market_cap_end,
+                   100 * (market_cap_end - market_cap_start) / NULLIF(market_cap_start, 0) AS gain
+            FROM {TABLE_WEEKLY_COMPANY_STATS}
+            WHERE week_start >= ? AND week_start < ?
+        )
+        GROUP BY week_start, industry_id
+        """,
+        (start, end),
+    )
+
+
+def drop_indexes(conn: sqlite3.Connection) -> None:
+    """Drop secondary indexes, e.g. before a bulk load that recreates them afterwards."""
+    for name, _ in index_statements():
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+
+
+# ── Migration steps ───────────────────────────────────────────────────────────
+
+def _m001_base_tables(conn: sqlite3.Connection) -> None:
+    """Fact, processed-file, first-seen and schema-manifest tables."""
+    for table in FACT_TABLES:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                date DATE, name TEXT, first_seen_date DATE, first_market_cap REAL
+            )
+        """)
+    for processed in PROCESSED_TABLES:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {processed} (date TEXT PRIMARY KEY)")
+
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_SCHEMA_MANIFEST} (
+            path TEXT PRIMARY KEY, size INTEGER, mtime REAL, columns TEXT
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_COMPANY_FIRST_SEEN} (
+            table_name TEXT NOT NULL,
+            name TEXT NOT NULL,
+            first_seen_date DATE,
+            first_market_cap REAL,
+            PRIMARY KEY (table_name, name)
+        )
+    """)
+    # Backfill first-seen rows for databases loaded before the dimension existed.
+    for table in FACT_TABLES:
+        if "market_cap" not in _table_columns(conn, table):
+            continue
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO {TABLE_COMPANY_FIRST_SEEN}
+                (table_name, name, first_seen_date, first_market_cap)
+            SELECT ?, name, date, market_cap FROM (
+                SELECT name, date, CAST(market_cap AS REAL) AS market_cap,
+                       ROW_NUMBER() OVER (PARTITION BY name ORDER BY date ASC, rowid ASC) AS rn
+                FROM {table}
+                WHERE name IS NOT NULL
+            ) WHERE rn = 1
+            """,
+            (table,),
+        )
+
+
+def _m002_fact_indexes(conn: sqlite3.Connection) -> None:
+    """Indexes on (date) and (name, date) for every fact table.
+
+    Processed-file tables are keyed by their date PRIMARY KEY, which SQLite
+    already backs with an index.
+    """
+    for table in FACT_TABLES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_date ON {table} (date)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name_date ON {table} (name, date)")
+
+
+def _m003_processed_file_hashes(conn: sqlite3.Connection) -> None:
+    """Content hash and row count on processed-file records."""
+    for processed in PROCESSED_TABLES:
+        existing = _table_columns(conn, processed)
+        if "content_hash" not in existing:
+            conn.execute(f"ALTER TABLE {processed} ADD COLUMN content_hash TEXT")
+        if "row_count" not in existing:
+            conn.execute(f"ALTER TABLE {processed} ADD COLUMN row_count INTEGER")
+
+
+def _m004_unique_date_name(conn: sqlite3.Connection) -> None:
+    """One row per (date, name) in every fact table.
+
+    Existing duplicates keep their most recently inserted row, matching the
+    ETL's upsert. The unique index also covers date-only lookups, so the
+    plain (date) index is dropped.
+    """
+    for table in FACT_TABLES:
+        conn.execute(f"""
+            DELETE FROM {table}
+            WHERE rowid NOT IN (SELECT MAX(rowid) FROM {table} GROUP BY date, name)
+        """)
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table}_date_name ON {table} (date, name)")
+        conn.execute(f"DROP INDEX IF EXISTS idx_{table}_date")
+
+
+def _m005_dimension_keys(conn: sqlite3.Connection) -> None:
+    """Intern company and industry names into dimension tables.
+
+    Each fact table moves to <table>_fact with company_id / industry_id in
+    place of the name / industry strings, and a view under the old name
+    joins the strings back so existing read queries keep working.
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_COMPANIES} (
+            company_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_INDUSTRIES} (
+            industry_id INTEGER PRIMARY KEY,
+            industry TEXT NOT NULL UNIQUE
+        )
+    """)
+    for table in FACT_TABLES:
+        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        names = [col for _, col, *_ in columns]
+        for col, (dimension, _) in DIMENSION_KEYS.items():
+            if col in names:
+                conn.execute(f"""
+                    INSERT OR IGNORE INTO {dimension} ({col})
+                    SELECT DISTINCT {col} FROM {table} WHERE {col} IS NOT NULL ORDER BY {col}
+                """)
+
+        definitions, targets, sources = [], [], []
+        for _, col, col_type, *_ in columns:
+            if col == "name":
+                definitions.append("company_id INTEGER NOT NULL")
+                targets.append("company_id")
+                sources.append("c.company_id")
+            elif col == "industry":
+                definitions.append("industry_id INTEGER")
+                targets.append("industry_id")
+                sources.append("i.industry_id")
+            else:
+                definitions.append(f"{col} {col_type}".strip())
+                targets.append(col)
+                sources.append(f"t.{col}")
+
+        conn.execute(f"CREATE TABLE {fact_table(table)} ({', '.join(definitions)})")
+        industry_join = (
+            f"LEFT JOIN {TABLE_INDUSTRIES} i ON i.industry = t.industry" if "industry" in names else ""
+        )
+        conn.execute(f"""
+            INSERT INTO {fact_table(table)} ({', '.join(targets)})
+            SELECT {', '.join(sources)}
+            FROM {table} t
+            JOIN {TABLE_COMPANIES} c ON c.name = t.name
+            {industry_join}
+            ORDER BY t.rowid
+        """)
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(
+            f"CREATE UNIQUE INDEX uq_{table}_date_company ON {fact_table(table)} (date, company_id)"
+        )
+        conn.execute(
+            f"CREATE INDEX idx_{table}_company_date ON {fact_table(table)} (company_id, date)"
+        )
+        if "industry" not in names:
+            conn.execute(f"ALTER TABLE {fact_table(table)} ADD COLUMN industry_id INTEGER")
+        refresh_fact_view(conn, table)
+
+
+def _m006_cumulative_hits(conn: sqlite3.Connection) -> None:
+    """Running per-company hit counts for every fact table.
+
+    <table>_hits has one row per fact row holding how many days the company
+    has appeared up to and including that date, so the hits in any date
+    window are the difference of two index lookups.
+    """
+    for table in FACT_TABLES:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {hits_table(table)} (
+                company_id INTEGER NOT NULL,
+                date DATE NOT NULL,
+                cum_hits INTEGER NOT NULL,
+                PRIMARY KEY (company_id, date)
+            ) WITHOUT ROWID
+        """)
+        rebuild_hits(conn, table)
+
+
+def _m007_latest_dates(conn: sqlite3.Connection) -> None:
+    """Each company's most recent date in every fact table.
+
+    <table>_latest replaces the MAX(date) ... GROUP BY self-join used to
+    find each company's latest row.
+    """
+    for table in FACT_TABLES:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {latest_table(table)} (
+                company_id INTEGER PRIMARY KEY,
+                date DATE NOT NULL
+            )
+        """)
+        rebuild_latest(conn, table)
+
+
+def _m008_weekly_stats(conn: sqlite3.Connection) -> None:
+    """Per-week company and industry aggregates of highs for the weekly report.
+
+    weekly_periods lists each Monday-based week with its first/last data date
+    and trading-day count; the stats tables are keyed by week_start so a
+    report reads two weeks without touching the fact table.
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_WEEKLY_PERIODS} (
+            week_start DATE PRIMARY KEY,
+            first_date DATE NOT NULL,
+            last_date DATE NOT NULL,
+            trading_days INTEGER NOT NULL
+        )
+    """)
+    # nse_code / bse_code are left untyped so codes keep whatever type the
+    # fact table stored them with.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_WEEKLY_COMPANY_STATS} (
+            week_start DATE NOT NULL,
+            company_id INTEGER NOT NULL,
+            hits INTEGER NOT NULL,
+            first_seen_in_week DATE,
+            last_seen_in_week DATE,
+            market_cap_start REAL,
+            market_cap_end REAL,
+            industry_id INTEGER,
+            nse_code,
+            bse_code,
+            PRIMARY KEY (week_start, company_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_WEEKLY_INDUSTRY_STATS} (
+            week_start DATE NOT NULL,
+            industry_id INTEGER,
+            count_stocks INTEGER NOT NULL,
+            total_hits INTEGER NOT NULL,
+            avg_hits REAL,
+            weighted_gain_mc REAL
+        )
+    """)
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_{TABLE_WEEKLY_INDUSTRY_STATS}_week "
+        f"ON {TABLE_WEEKLY_INDUSTRY_STATS} (week_start)"
+    )
+    refresh_weekly_stats(conn)
+
+
+def _m009_registry_column_types(conn: sqlite3.Connection) -> None:
+    """Declare fact-table columns with their SQL_COLUMN_TYPES type.
+
+    Columns used to be typed from the first CSV that had them, which left
+    text codes such as nse_code declared REAL. SQLite cannot retype a column
+    in place, so an affected table is copied into a correctly declared one.
+    """
+    for table in FACT_TABLES:
+        physical = fact_table(table)
+        columns = conn.execute(f"PRAGMA table_info({physical})").fetchall()
+        definitions = [
+            f"{col} {SQL_COLUMN_TYPES.get(col, col_type)}".strip() + (" NOT NULL" if notnull else "")
+            for _, col, col_type, notnull, *_ in columns
+        ]
+        if all(SQL_COLUMN_TYPES.get(col, col_type) == col_type for _, col, col_type, *_ in columns):
+            continue
+
+        conn.execute(f"DROP VIEW IF EXISTS {table}")
+        conn.execute(f"ALTER TABLE {physical} RENAME TO {physical}_retype")
+        conn.execute(f"CREATE TABLE {physical} ({', '.join(definitions)})")
+        conn.execute(f"INSERT INTO {physical} SELECT * FROM {physical}_retype ORDER BY rowid")
+        conn.execute(f"DROP TABLE {physical}_retype")
+        conn.execute(f"CREATE UNIQUE INDEX uq_{table}_date_company ON {physical} (date, company_id)")
+        conn.execute(f"CREATE INDEX idx_{table}_company_date ON {physical} (company_id, date)")
+        refresh_fact_view(conn, table)
+
+
+MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    _m001_base_tables,
+    _m002_fact_indexes,
+    _m003_processed_file_hashes,
+    _m004_unique_date_name,
+    _m005_dimension_keys,
+    _m006_cumulative_hits,
+    _m007_latest_dates,
+    _m008_weekly_stats,
+    _m009_registry_column_types,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Apply any pending migrations in order and return the resulting version.
+
+    Each step runs in its own BEGIN IMMEDIATE transaction together with its
+    version bump, and re-reads user_version once it holds the write lock.
+    When the app and the ETL migrate at the same time, the second one waits
+    and then skips the steps the first has applied; an interrupted run
+    resumes from the last completed step.
+    """
+    version = get_schema_version(conn)
+    while version < len(MIGRATIONS):
+        conn.commit()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            version = get_schema_version(conn)
+            if version < len(MIGRATIONS):
+                MIGRATIONS[version](conn)
+                version += 1
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return version
@@ -1,8 +1,67 @@
 import datetime
 import sqlite3
+from contextlib import closing
+
 import pandas as pd
 import streamlit as st
-from config import DB_PATH, CACHE_TTL, TABLE_HIGHS, TABLE_FIVETOFIFTYCLUB, TABLE_DOWNFROMHIGH
+from config import (
+    DB_PATH,
+    CACHE_TTL,
+    COLUMN_TYPES,
+    DATA_VERSION_FILE,
+    PARQUET_DIR,
+    ROLLING_WINDOWS,
+    TABLE_COMPANIES,
+    TABLE_COMPANY_FIRST_SEEN,
+    TABLE_HIGHS,
+    TABLE_FIVETOFIFTYCLUB,
+    TABLE_DOWNFROMHIGH,
+    TABLE_INDUSTRIES,
+    TABLE_WEEKLY_COMPANY_STATS,
+    TABLE_WEEKLY_INDUSTRY_STATS,
+    TABLE_WEEKLY_PERIODS,
+)
+from db_migrations import apply_migrations, fact_table, hits_table, latest_table
+
+
+@st.cache_resource
+def _migrated_schema_version() -> int:
+    with closing(sqlite3.connect(DB_PATH, timeout=60)) as conn:
+        return apply_migrations(conn)
+
+
+def ensure_schema() -> int | None:
+    """Apply pending schema migrations once per app process.
+
+    Only a successful run is cached; after an error the next rerun retries.
+    """
+    try:
+        return _migrated_schema_version()
+    except sqlite3.Error as e:
+        st.error(f"Database error applying migrations: {e}")
+        return None
+
+
+@st.cache_resource
+def _loaded_data_version() -> dict:
+    return {"version": None}
+
+
+def sync_data_version() -> None:
+    """Clear cached query results once the ETL has committed new data.
+
+    The ETL rewrites DATA_VERSION_FILE after every load (including each
+    `--watch` poll that finds new CSVs), so a new day shows up on the next
+    rerun instead of after CACHE_TTL.
+    """
+    try:
+        version = DATA_VERSION_FILE.read_text().strip()
+    except OSError:
+        return
+    loaded = _loaded_data_version()
+    if loaded["version"] is not None and loaded["version"] != version:
+        st.cache_data.clear()
+    loaded["version"] = version
 
 
 def register_adapters() -> None:
@@ -23,7 +82,7 @@ def get_fivetofiftyclub_dates():
     """Fetch distinct dates from fivetofiftyclub table."""
     try:
         with sqlite3.connect(DB_PATH) as conn:
-            query = f"SELECT DISTINCT date FROM {TABLE_FIVETOFIFTYCLUB} ORDER BY date"
+            query = f"SELECT DISTINCT date FROM {fact_table(TABLE_FIVETOFIFTYCLUB)} ORDER BY date"
             df = pd.read_sql(query, conn)
             return df["date"].tolist()
     except sqlite3.Error as e:
@@ -45,7 +104,7 @@ def get_downfromhigh_dates():
     """Fetch distinct dates from downfromhigh table."""
     try:
         with sqlite3.connect(DB_PATH) as conn:
-            query = f"SELECT DISTINCT date FROM {TABLE_DOWNFROMHIGH} ORDER BY date"
+            query = f"SELECT DISTINCT date FROM {fact_table(TABLE_DOWNFROMHIGH)} ORDER BY date"
             df = pd.read_sql(query, conn)
             return df["date"].tolist()
     except sqlite3.Error as e:
@@ -69,7 +128,7 @@ def get_latest_table_date(table_name: str) -> datetime.date | None:
     """Return the latest date available in a source table."""
     try:
         with sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
-            row = conn.execute(f"SELECT MAX(date) FROM {table_name}").fetchone()
+            row = conn.execute(f"SELECT MAX(date) FROM {fact_table(table_name)}").fetchone()
         if not row or row[0] is None:
             return None
         return pd.to_datetime(row[0]).date()
@@ -77,19 +136,44 @@ def get_latest_table_date(table_name: str) -> datetime.date | None:
         st.error(f"Database error fetching latest date from {table_name}: {e}")
         return None
 
+@st.cache_data(ttl=CACHE_TTL)
+def get_company_first_seen(table_name: str = TABLE_HIGHS) -> pd.DataFrame:
+    """Return name, first_market_cap and first_seen_date per company from the ETL dimension."""
+    try:
+        with sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
+            df = pd.read_sql(
+                f"""
+                SELECT name, first_market_cap, first_seen_date
+                FROM {TABLE_COMPANY_FIRST_SEEN}
+                WHERE table_name = ?
+                """,
+                conn,
+                params=(table_name,),
+            )
+        df["first_seen_date"] = pd.to_datetime(df["first_seen_date"])
+        return _apply_standard_types(df)
+    except sqlite3.Error as e:
+        st.error(f"Database error fetching first-seen data for {table_name}: {e}")
+        return pd.DataFrame(columns=["name", "first_market_cap", "first_seen_date"])
+
 # ----------------------------------------------------------------------
 # 📄  Cached data helpers
 # ----------------------------------------------------------------------
 def _apply_standard_types(df: pd.DataFrame) -> pd.DataFrame:
-    """Apply standard type conversions to dataframe columns."""
-    if "bse_code" in df.columns:
-        df["bse_code"] = pd.to_numeric(df["bse_code"], errors="coerce").astype("Int64")
-    if "nse_code" in df.columns:
-        df["nse_code"] = df["nse_code"].astype("string")
-    if "industry" in df.columns:
-        df["industry"] = df["industry"].astype("string")
-    if "name" in df.columns:
-        df["name"] = df["name"].astype("string")
+    """Apply the COLUMN_TYPES dtypes to the columns df has."""
+    for col, dtype in COLUMN_TYPES.items():
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce") if dtype == "Int64" else df[col]
+        df[col] = values.astype(dtype)
+    return df
+
+
+def _apply_categorical_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Store the repeated name / industry labels of large frames as categoricals."""
+    for col in ("name", "industry"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
     return df
 
 
@@ -169,7 +253,7 @@ def compute_industry_tailwind_stats(
         return (valid["%_gain_mc"] * valid["market_cap"]).sum() / valid["market_cap"].sum()
 
     industry_stats = (
-        working.groupby("industry", dropna=False)
+        working.groupby("industry", dropna=False, observed=True)
         .agg(
             count_stocks=("name", "count"),
             total_hits=(hits_col, "sum"),
@@ -178,7 +262,7 @@ def compute_industry_tailwind_stats(
         .reset_index()
     )
     weighted_gain = (
-        working.groupby("industry", dropna=False)
+        working.groupby("industry", dropna=False, observed=True)
         .apply(_weighted_gain, include_groups=False)
         .rename("weighted_gain_mc")
         .reset_index()
@@ -187,6 +271,58 @@ def compute_industry_tailwind_stats(
     return industry_stats.merge(weighted_gain, on="industry", how="left")
 
 
+def _rolling_hit_counts(
+    conn: sqlite3.Connection,
+    table_name: str,
+    windows: dict[str, tuple[datetime.date, datetime.date]],
+) -> pd.DataFrame:
+    """Return per-company hit counts for each named (start, end) date window, indexed by name.
+
+    Counts come from the ETL's cumulative hits table as a difference of two
+    prefix sums, so every window costs two index lookups per company. A
+    company with no hits in a window gets NaN, as if a GROUP BY omitted it.
+    """
+    hits = hits_table(table_name)
+
+    def _cumulative(op: str) -> str:
+        return f"""COALESCE((
+            SELECT h.cum_hits FROM {hits} h
+            WHERE h.company_id = ids.company_id AND h.date {op} ?
+            ORDER BY h.date DESC LIMIT 1
+        ), 0)"""
+
+    select, params = [], []
+    for col, (start, end) in windows.items():
+        select.append(f"NULLIF({_cumulative('<=')} - {_cumulative('<')}, 0) AS {col}")
+        params += [end, start]
+    return pd.read_sql(
+        f"""
+        SELECT c.name, {', '.join(select)}
+        FROM (SELECT DISTINCT company_id FROM {hits}) ids
+        JOIN {TABLE_COMPANIES} c ON c.company_id = ids.company_id
+        """,
+        conn,
+        params=params,
+    ).set_index("name")
+
+
+def _latest_snapshot(conn: sqlite3.Connection, table_name: str) -> pd.DataFrame:
+    """Return each company's most recent row of table_name, indexed by name.
+
+    Driven by the ETL's per-company latest-date table, so every company costs
+    one index lookup instead of a MAX(date) self-join.
+    """
+    return pd.read_sql(
+        f"""
+        SELECT h.*
+        FROM {latest_table(table_name)} l
+        JOIN {TABLE_COMPANIES} c ON c.company_id = l.company_id
+        JOIN {table_name} h ON h.name = c.name AND h.date = l.date
+        """,
+        conn,
+    ).set_index("name")
+
+
 @st.cache_data(ttl=CACHE_TTL)
 def get_tailwind_stocks(lookback_days: int = 60, min_hits: int = 5) -> pd.DataFrame:
     """Return stocks with >= min_hits appearances in the last lookback_days days,
@@ -197,28 +333,10 @@ def get_tailwind_stocks(lookback_days: int = 60, min_hits: int = 5) -> pd.DataFr
     since = latest_date - datetime.timedelta(days=lookback_days - 1)
 
     with sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
-        hits = pd.read_sql(
-            f"""
-            SELECT name, COUNT(*) AS hits_in_window
-            FROM {TABLE_HIGHS}
-            WHERE date BETWEEN ? AND ?
-            GROUP BY name
-            HAVING hits_in_window >= ?
-            """,
-            conn,
-            params=(since, latest_date, min_hits),
-        ).set_index("name")
-
-        latest_snap = pd.read_sql(
-            f"""
-            SELECT h.*
-            FROM {TABLE_HIGHS} h
-            JOIN (
-                SELECT name, MAX(date) AS max_date FROM {TABLE_HIGHS} GROUP BY name
-            ) m ON h.name = m.name AND h.date = m.max_date
-            """,
-            conn,
-        ).set_index("name")
+        hits = _rolling_hit_counts(conn, TABLE_HIGHS, {"hits_in_window": (since, latest_date)})
+        hits = hits[hits["hits_in_window"] >= min_hits].astype(int)
+
+        latest_snap = _latest_snapshot(conn, TABLE_HIGHS)
 
     df = latest_snap.join(hits, how="inner")
     for col in ["market_cap", "first_market_cap", "first_seen_date"]:
@@ -239,34 +357,18 @@ def get_momentum_summary() -> pd.DataFrame:
         if latest_date is None:
             return pd.DataFrame()
         with sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
-            def _hit_counts(days: int) -> pd.DataFrame:
-                since = latest_date - datetime.timedelta(days=days - 1)
-                q = f"""
-                    SELECT name, COUNT(*) AS hits_{days}
-                    FROM {TABLE_HIGHS}
-                    WHERE date BETWEEN ? AND ?
-                    GROUP BY name
-                """
-                return pd.read_sql(q, conn, params=(since, latest_date)).set_index("name")
-
-            # Rolling hit counts
-            counts7  = _hit_counts(7)
-            counts30 = _hit_counts(30)
-            counts60 = _hit_counts(60)
+            # Rolling hit counts (hits_7, hits_30, hits_60 for the default windows)
+            counts = _rolling_hit_counts(
+                conn,
+                TABLE_HIGHS,
+                {
+                    f"hits_{days}": (latest_date - datetime.timedelta(days=days - 1), latest_date)
+                    for days in ROLLING_WINDOWS
+                },
+            )
 
             # Latest snapshot for each stock
-            latest = pd.read_sql(
-                f"""
-                SELECT h1.*
-                FROM {TABLE_HIGHS} h1
-                JOIN (
-                    SELECT name, MAX(date) AS max_date
-                    FROM {TABLE_HIGHS}
-                    GROUP BY name
-                ) h2 ON h1.name = h2.name AND h1.date = h2.max_date
-                """,
-                conn,
-            ).set_index("name")
+            latest = _latest_snapshot(conn, TABLE_HIGHS)
 
         # Add missing columns if needed (due to old rows)
         for col in ["market_cap", "first_market_cap", "first_seen_date"]:
@@ -287,10 +389,10 @@ def get_momentum_summary() -> pd.DataFrame:
                 latest[col] = pd.NA
 
         df = latest[required_cols]
-        df = df.join(counts7).join(counts30).join(counts60)
+        df = df.join(counts)
         df = _apply_standard_types(df)
-        
-        return df.reset_index()
+
+        return _apply_categorical_types(df.reset_index())
     except sqlite3.Error as e:
         st.error(f"Database error fetching momentum summary: {e}")
         return pd.DataFrame()
@@ -326,7 +428,7 @@ def get_persistence_scores() -> pd.DataFrame:
 @st.cache_data(ttl=CACHE_TTL)
 def get_frequency_timeline(stock_name: str, weeks: int = 12) -> pd.DataFrame:
     """Get weekly 52W-high frequency trend for a given stock."""
-    df = get_historical_market_cap()
+    df = get_historical_market_cap(("date", "name", "market_cap"))
     if df.empty or "date" not in df.columns:
         return pd.DataFrame()
 
@@ -348,45 +450,110 @@ def get_frequency_timeline(stock_name: str, weeks: int = 12) -> pd.DataFrame:
     return weekly
 
 
+def _read_parquet_mirror(table_name: str, columns: tuple[str, ...] | None = None) -> pd.DataFrame | None:
+    """Load table_name from the ETL's monthly Parquet mirror.
+
+    Files are memory-mapped and only the requested columns are decoded.
+    Returns None when the mirror is missing or unreadable, or when its
+    monthly partitions or their row counts differ from the database, so
+    callers can fall back to SQLite.
+    """
+    files = sorted((PARQUET_DIR / table_name).glob("*.parquet"))
+    if not files:
+        return None
+    try:
+        import pyarrow.parquet as pq
+
+        with closing(sqlite3.connect(DB_PATH)) as conn:
+            expected = dict(conn.execute(
+                f"SELECT substr(date, 1, 7), COUNT(*) FROM {fact_table(table_name)} "
+                "WHERE date IS NOT NULL GROUP BY 1"
+            ))
+        if {f.stem: pq.read_metadata(f).num_rows for f in files} != expected:
+            return None
+        frames = []
+        for f in files:
+            available = pq.read_schema(f).names
+            cols = [c for c in columns if c in available] if columns else None
+            frames.append(pd.read_parquet(f, columns=cols, memory_map=True))
+    except Exception:
+        return None
+
+    df = pd.concat(frames, ignore_index=True)
+    return df if "date" in df.columns else None
+
+
 @st.cache_data(ttl=CACHE_TTL)
-def get_historical_market_cap() -> pd.DataFrame:
-    """Fetch historical market cap data with caching (TTL from config)."""
+def get_historical_market_cap(columns: tuple[str, ...] | None = None) -> pd.DataFrame:
+    """Fetch historical highs rows with caching (TTL from config).
+
+    Reads the Parquet mirror when it is current, otherwise SQLite. Pass
+    columns to load only those (date is always included). Name and industry
+    are returned as categoricals.
+    """
+    if columns and "date" not in columns:
+        columns = ("date", *columns)
     try:
-        with sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
-            df = pd.read_sql(f"SELECT * FROM {TABLE_HIGHS}", conn)
-        
-        df["date"] = pd.to_datetime(df["date"])
+        df = _read_parquet_mirror(TABLE_HIGHS, columns)
+        if df is None:
+            select = ", ".join(columns) if columns else "*"
+            with sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
+                df = pd.read_sql(f"SELECT {select} FROM {TABLE_HIGHS} ORDER BY date, name", conn)
+
+        # Parquet and SQLite hand back dates in different units; pin one.
+        for col in ("date", "first_seen_date"):
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col]).astype("datetime64[ns]")
         df = _apply_standard_types(df)
-        return df
+        return _apply_categorical_types(df)
     except sqlite3.Error as e:
         st.error(f"Database error fetching historical market cap: {e}")
         return pd.DataFrame()
 
 
+def _read_weekly_periods(conn: sqlite3.Connection) -> pd.DataFrame:
+    weeks = pd.read_sql(
+        f"""
+        SELECT week_start, first_date, last_date, trading_days
+        FROM {TABLE_WEEKLY_PERIODS}
+        ORDER BY week_start
+        """,
+        conn,
+    )
+    for col in ["week_start", "first_date", "last_date"]:
+        weeks[col] = pd.to_datetime(weeks[col])
+    return weeks
+
+
+def _week_index(weeks: pd.DataFrame, week_start: datetime.date) -> int:
+    """Return the position of week_start in weeks, or -1 if there is no such week."""
+    matches = weeks.index[weeks["week_start"] == pd.Timestamp(week_start)]
+    return int(matches[0]) if len(matches) else -1
+
+
 def _build_weekly_company_snapshot(
-    hist_df: pd.DataFrame,
+    conn: sqlite3.Connection,
     week_start: pd.Timestamp,
 ) -> pd.DataFrame:
-    """Summarize one calendar week of highs data at the company level."""
-    week_df = hist_df[hist_df["week_start"] == week_start].copy()
-    if week_df.empty:
+    """Read one calendar week of highs data summarized at the company level."""
+    summary = pd.read_sql(
+        f"""
+        SELECT c.name, w.hits, w.first_seen_in_week, w.last_seen_in_week,
+               w.market_cap_start, w.market_cap_end, i.industry, w.nse_code, w.bse_code
+        FROM {TABLE_WEEKLY_COMPANY_STATS} w
+        JOIN {TABLE_COMPANIES} c ON c.company_id = w.company_id
+        LEFT JOIN {TABLE_INDUSTRIES} i ON i.industry_id = w.industry_id
+        WHERE w.week_start = ?
+        ORDER BY c.name
+        """,
+        conn,
+        params=(week_start.date().isoformat(),),
+    )
+    if summary.empty:
         return pd.DataFrame()
 
-    week_df = week_df.sort_values(["name", "date"])
-    summary = (
-        week_df.groupby("name", dropna=False)
-        .agg(
-            hits=("date", "nunique"),
-            first_seen_in_week=("date", "min"),
-            last_seen_in_week=("date", "max"),
-            market_cap_start=("market_cap", "first"),
-            market_cap_end=("market_cap", "last"),
-            industry=("industry", "last"),
-            nse_code=("nse_code", "last"),
-            bse_code=("bse_code", "last"),
-        )
-        .reset_index()
-    )
+    for col in ["first_seen_in_week", "last_seen_in_week"]:
+        summary[col] = pd.to_datetime(summary[col])
     summary["gain_pct"] = (
         100 * (summary["market_cap_end"] - summary["market_cap_start"])
         / summary["market_cap_start"].replace(0, pd.NA)
@@ -395,72 +562,83 @@ def _build_weekly_company_snapshot(
     return _apply_standard_types(summary)
 
 
-def _build_weekly_industry_snapshot(weekly_df: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate one weekly company snapshot into industry-level stats."""
-    if weekly_df.empty:
+def _build_weekly_industry_snapshot(
+    conn: sqlite3.Connection,
+    week_start: pd.Timestamp,
+) -> pd.DataFrame:
+    """Read one calendar week of industry-level stats (see compute_industry_tailwind_stats)."""
+    stats = pd.read_sql(
+        f"""
+        SELECT i.industry, s.count_stocks, s.total_hits, s.avg_hits, s.weighted_gain_mc
+        FROM {TABLE_WEEKLY_INDUSTRY_STATS} s
+        LEFT JOIN {TABLE_INDUSTRIES} i ON i.industry_id = s.industry_id
+        WHERE s.week_start = ?
+        ORDER BY i.industry IS NULL, i.industry
+        """,
+        conn,
+        params=(week_start.date().isoformat(),),
+    )
+    if stats.empty:
         return pd.DataFrame()
+    return _apply_standard_types(stats)
 
-    working = weekly_df.rename(
-        columns={
-            "hits": "hits_in_window",
-            "gain_pct": "%_gain_mc",
-            "market_cap_end": "market_cap",
-        }
-    )
-    return compute_industry_tailwind_stats(working, hits_col="hits_in_window")
+
+@st.cache_data(ttl=CACHE_TTL)
+def get_weekly_periods() -> pd.DataFrame:
+    """Return every week of highs data with its first/last data date and trading days."""
+    try:
+        with sqlite3.connect(DB_PATH) as conn:
+            return _read_weekly_periods(conn)
+    except sqlite3.Error as e:
+        st.error(f"Database error fetching weekly periods: {e}")
+        return pd.DataFrame()
 
 
 @st.cache_data(ttl=CACHE_TTL)
-def get_weekly_report_snapshot() -> dict[str, object]:
+def get_weekly_report_snapshot(
+    report_week_start: datetime.date | None = None,
+    compare_week_start: datetime.date | None = None,
+) -> dict[str, object]:
     """Return a concise, completed-week comparison for weekly reporting.
 
-    The report intentionally skips an incomplete current week when the latest
-    highs data is from Monday-Thursday. That keeps the report focused on the
-    last finished trading week rather than noisy partial data.
+    By default the report intentionally skips an incomplete current week when
+    the latest highs data is from Monday-Thursday. That keeps the report
+    focused on the last finished trading week rather than noisy partial data.
+    Pass report_week_start (and optionally compare_week_start, which defaults
+    to the week before it) to compare any two weeks from get_weekly_periods().
     """
-    hist_df = get_historical_market_cap()
-    if hist_df.empty or "date" not in hist_df.columns:
-        return {}
+    try:
+        with sqlite3.connect(DB_PATH) as conn:
+            weeks = _read_weekly_periods(conn)
+            if weeks.empty:
+                return {}
 
-    working = hist_df.copy()
-    working["date"] = pd.to_datetime(working["date"], errors="coerce").dt.normalize()
-    working = working.dropna(subset=["date", "name"])
-    if working.empty:
-        return {}
+            latest_date = weeks["last_date"].max()
+            latest_week_partial = False
+            if report_week_start is None:
+                latest_week_partial = latest_date.weekday() < 4
+                report_idx = len(weeks) - 2 if latest_week_partial else len(weeks) - 1
+            else:
+                report_idx = _week_index(weeks, report_week_start)
+            if compare_week_start is None:
+                compare_idx = report_idx - 1
+            else:
+                compare_idx = _week_index(weeks, compare_week_start)
+            if report_idx < 0 or compare_idx < 0:
+                return {}
 
-    working["week_start"] = working["date"].dt.to_period("W").dt.start_time
-    week_dates = (
-        working[["date", "week_start"]]
-        .drop_duplicates()
-        .sort_values("date")
-    )
-    if week_dates.empty:
-        return {}
+            report_week = weeks.iloc[report_idx]
+            compare_week = weeks.iloc[compare_idx]
 
-    weeks = (
-        week_dates.groupby("week_start", as_index=False)
-        .agg(
-            first_date=("date", "min"),
-            last_date=("date", "max"),
-            trading_days=("date", "nunique"),
-        )
-        .sort_values("week_start")
-        .reset_index(drop=True)
-    )
+            this_week = _build_weekly_company_snapshot(conn, report_week["week_start"])
+            last_week = _build_weekly_company_snapshot(conn, compare_week["week_start"])
+            if this_week.empty or last_week.empty:
+                return {}
 
-    latest_date = pd.to_datetime(week_dates["date"].max())
-    latest_week_partial = latest_date.weekday() < 4
-    report_idx = len(weeks) - 2 if latest_week_partial else len(weeks) - 1
-    compare_idx = report_idx - 1
-    if compare_idx < 0:
-        return {}
-
-    report_week = weeks.iloc[report_idx]
-    compare_week = weeks.iloc[compare_idx]
-
-    this_week = _build_weekly_company_snapshot(working, report_week["week_start"])
-    last_week = _build_weekly_company_snapshot(working, compare_week["week_start"])
-    if this_week.empty or last_week.empty:
+            industry_this = _build_weekly_industry_snapshot(conn, report_week["week_start"])
+            industry_last = _build_weekly_industry_snapshot(conn, compare_week["week_start"])
+    except sqlite3.Error as e:
+        st.error(f"Database error fetching weekly report: {e}")
         return {}
 
     merged = pd.merge(
@@ -508,8 +686,6 @@ def get_weekly_report_snapshot() -> dict[str, object]:
     merged["status"] = merged.apply(_status, axis=1)
     comparison = _apply_standard_types(merged.reset_index(drop=True))
 
-    industry_this = _build_weekly_industry_snapshot(this_week)
-    industry_last = _build_weekly_industry_snapshot(last_week)
     industry_comparison = pd.merge(
         industry_this,
         industry_last,
@@ -571,7 +747,7 @@ def get_all_dates() -> list[datetime.date]:
     """Fetch all distinct dates with caching (TTL from config)."""
     try:
         with sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
-            df = pd.read_sql(f"SELECT DISTINCT date FROM {TABLE_HIGHS} ORDER BY date", conn)
+            df = pd.read_sql(f"SELECT DISTINCT date FROM {fact_table(TABLE_HIGHS)} ORDER BY date", conn)
         return pd.to_datetime(df["date"]).dt.date.tolist()
     except sqlite3.Error as e:
         st.error(f"Database error fetching dates: {e}")
@@ -606,33 +782,15 @@ def get_im_momentum_scores() -> pd.DataFrame:
         since_1y = latest_date - datetime.timedelta(days=365)
 
         with sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES) as conn:
-            yearly = pd.read_sql(
-                f"""
-                SELECT name,
-                       COUNT(DISTINCT date) AS hits_1y,
-                       MAX(date)            AS last_seen
-                FROM {TABLE_HIGHS}
-                WHERE date BETWEEN ? AND ?
-                GROUP BY name
-                """,
-                conn,
-                params=(since_1y, latest_date),
-            ).set_index("name")
+            yearly = _rolling_hit_counts(conn, TABLE_HIGHS, {"hits_1y": (since_1y, latest_date)})
 
-            latest_snap = pd.read_sql(
-                f"""
-                SELECT h.*
-                FROM {TABLE_HIGHS} h
-                JOIN (
-                    SELECT name, MAX(date) AS max_date FROM {TABLE_HIGHS} GROUP BY name
-                ) m ON h.name = m.name AND h.date = m.max_date
-                """,
-                conn,
-            ).set_index("name")
+            latest_snap = _latest_snapshot(conn, TABLE_HIGHS)
 
         df = latest_snap.join(yearly, how="left")
+        # The window ends at the latest date, so a company's last hit in it is
+        # its latest row — when it has any hits in the window at all.
+        df["last_seen"] = pd.to_datetime(df["date"]).where(df["hits_1y"].notna())
         df["hits_1y"] = df["hits_1y"].fillna(0).astype(int)
-        df["last_seen"] = pd.to_datetime(df["last_seen"])
         df["days_since_last_high"] = (pd.Timestamp(latest_date) - df["last_seen"]).dt.days
 
         for col in ["market_cap", "first_market_cap"]:
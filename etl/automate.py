@@ -6,13 +6,16 @@ Daily pipeline orchestrator — runs in one repo (52WeekHighApp).
 Steps:
   1. Fetch today's Screener.in CSVs  (daily_screen_exports.py)
   2. Load CSVs into highs.db          (etl.py)
-  3. Git pull / add / commit / push
+  3. Prefetch company data for the latest snapshot into screener_cache.db
+                                      (prefetch_company_data.py)
+  4. Git pull / add / commit / push
 
 Run:
     python etl/automate.py
     python etl/automate.py --skip-downloads   # reuse today's CSVs already on disk
     python etl/automate.py --no-git           # skip git operations
-    python etl/automate.py --dev              # skip downloads + git (local testing)
+    python etl/automate.py --skip-prefetch    # skip the company-data prefetch
+    python etl/automate.py --dev              # skip downloads, prefetch + git (local testing)
 
 Credentials / config:
     Set SCREENER_USERNAME and SCREENER_PASSWORD as env vars,
@@ -121,16 +124,19 @@ def main() -> None:
                         help="Skip fetching new CSVs (reuse what's on disk).")
     parser.add_argument("--no-git", action="store_true",
                         help="Skip git pull/add/commit/push.")
+    parser.add_argument("--skip-prefetch", action="store_true",
+                        help="Skip prefetching Screener.in company data.")
     parser.add_argument("--dev", action="store_true",
-                        help="Dev mode: skip downloads and git.")
+                        help="Dev mode: skip downloads, prefetch and git.")
     args = parser.parse_args()
 
     skip_downloads = args.skip_downloads or args.dev
+    skip_prefetch  = args.skip_prefetch or args.dev
     skip_git       = args.no_git or args.dev
 
     logging.info("=" * 60)
     logging.info("Pipeline started at %s", datetime.now().isoformat(timespec="seconds"))
-    logging.info("skip_downloads=%s  skip_git=%s", skip_downloads, skip_git)
+    logging.info("skip_downloads=%s  skip_prefetch=%s  skip_git=%s", skip_downloads, skip_prefetch, skip_git)
     logging.info("=" * 60)
 
     # Step 1 — Fetch CSVs
@@ -144,14 +150,21 @@ def main() -> None:
     logging.info("Step 2: Running ETL…")
     run(f"{PYTHON_CMD} etl/etl.py")
 
-    # Step 3 — Git
+    # Step 3 — Company data for the valuation pages (resumable; cache is gitignored)
+    if skip_prefetch:
+        logging.info("Step 3: Skipping company-data prefetch.")
+    else:
+        logging.info("Step 3: Prefetching Screener.in company data…")
+        run(f"{PYTHON_CMD} etl/prefetch_company_data.py", check=False)
+
+    # Step 4 — Git
     if skip_git:
-        logging.info("Step 3: Skipping git operations.")
+        logging.info("Step 4: Skipping git operations.")
     else:
-        logging.info("Step 3: Git operations…")
+        logging.info("Step 4: Git operations…")
         ensure_branch(REPO_BRANCH)
         run("git pull")
-        run("git add *")
+        run("git add -A")
         run('git commit -m "Today"', check=False)
         run("git push")
 
@@ -0,0 +1,129 @@
+"""
+bench_screener.py
+
+Times the Screener.in exporter (login + all SCREENS) and screener_fetch
+against etl/screener_stub.py, so throughput changes can be measured
+without touching the live site.
+
+Run:
+    python etl/bench_screener.py                       # in-process stub, no latency
+    python etl/bench_screener.py --latency 0.1 --error-rate 0.05
+    python etl/bench_screener.py --company-requests 30 --threads 4 --fetch-rate 0
+    python etl/bench_screener.py --base-url http://127.0.0.1:8765   # stub already running
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import daily_screen_exports  # noqa: E402
+import screener_fetch  # noqa: E402
+from rate_limit import TokenBucket  # noqa: E402
+from screener_stub import FIXTURES_DIR, start_server  # noqa: E402
+
+
+def _served(base_url: str) -> int:
+    """Total requests the stub has served so far."""
+    return sum(requests.get(f"{base_url}/__stats__", timeout=5).json().values())
+
+
+def bench_exporter(base_url: str, runs: int) -> None:
+    """Run login + export_screens() runs times; the first run logs in, later ones reuse the session."""
+    with tempfile.TemporaryDirectory() as tmp:
+        dest = Path(tmp)
+        session_file = dest / "session.json"
+        date_str = datetime.today().strftime("%Y-%m-%d")
+        for run in range(1, runs + 1):
+            before = _served(base_url)
+            started = time.perf_counter()
+            session = daily_screen_exports._make_session()
+            try:
+                daily_screen_exports.ensure_logged_in(session, "bench", "bench", session_file)
+            except Exception as exc:
+                print(f"exporter run {run}: login failed after {time.perf_counter() - started:.2f}s: {exc}")
+                continue
+            statuses = daily_screen_exports.export_screens(session, date_str, dest)
+            elapsed = time.perf_counter() - started
+            served = _served(base_url) - before
+            failed = sum(s.startswith("Failed") for s in statuses)
+            print(
+                f"exporter run {run}: {elapsed:.2f}s, {len(statuses) - failed}/{len(statuses)} screens, "
+                f"{served} requests ({served / elapsed:.1f} req/s)"
+            )
+            for status in statuses:
+                if status.startswith("Failed"):
+                    print(f"  {status}")
+
+
+def bench_fetcher(base_url: str, symbols: list[str], requests_total: int, threads: int) -> None:
+    """Fetch and parse requests_total company pages (bypassing the in-process cache)."""
+    if not symbols:
+        print("fetcher: no company fixtures")
+        return
+    targets = [symbols[i % len(symbols)] for i in range(requests_total)]
+    before = _served(base_url)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(screener_fetch._fetch_company_data, targets))
+    elapsed = time.perf_counter() - started
+    served = _served(base_url) - before
+    errors = sum(r.error is not None for r in results)
+    print(
+        f"fetcher: {requests_total} companies on {threads} thread(s) in {elapsed:.2f}s "
+        f"({requests_total / elapsed:.1f} companies/s, {served / elapsed:.1f} req/s), {errors} errors"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Screener.in clients against the stub server.")
+    parser.add_argument("--base-url", default=None, help="Use a running stub instead of starting one.")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--export-runs", type=int, default=2, help="Exporter runs (first one logs in).")
+    parser.add_argument("--company-requests", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=1, help="Threads calling fetch_company_data.")
+    parser.add_argument(
+        "--fetch-rate", type=float, default=None,
+        help="Override screener_fetch's requests/second (0 = unthrottled).",
+    )
+    parser.add_argument("--fetch-burst", type=int, default=None, help="Override screener_fetch's burst size.")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = start_server(
+            latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed
+        )
+        base_url = server.base_url
+    daily_screen_exports.BASE_URL = base_url
+    screener_fetch.BASE_URL = base_url
+    if args.fetch_rate is not None or args.fetch_burst is not None:
+        screener_fetch._limiter = TokenBucket(
+            screener_fetch._limiter.rate if args.fetch_rate is None else args.fetch_rate,
+            screener_fetch._limiter.burst if args.fetch_burst is None else args.fetch_burst,
+        )
+    print(f"Benchmarking against {base_url}")
+
+    symbols = sorted(p.name for p in (FIXTURES_DIR / "company").iterdir() if p.is_dir())
+    bench_exporter(base_url, args.export_runs)
+    bench_fetcher(base_url, symbols, args.company_requests, args.threads)
+
+    print("Requests by route:", json.dumps(requests.get(f"{base_url}/__stats__", timeout=5).json()))
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
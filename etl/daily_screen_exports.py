@@ -4,6 +4,22 @@ daily_screen_exports.py
 Fetches the three Screener.in screens as CSV files and saves them into
 screener_downloads/<subfolder>/screener_YYYY-MM-DD.csv.
 
+Screens are fetched concurrently by a small thread pool that shares one
+logged-in, connection-pooled session; a shared token bucket (rate_limit.py)
+keeps the combined request rate polite.
+
+The login cookies are saved to .screener_session.json (readable by the
+owner only) and reused while Screener.in still accepts them, so most runs
+skip the login round-trips.
+
+Each export is streamed to a .part file next to its destination, checked
+(CSV header with a Name column) and renamed into place, so the saved
+file is byte-for-byte what the server sent and a failed download never
+leaves a partial CSV behind.
+
+Requests go to SCREENER_BASE_URL (env var, default https://www.screener.in),
+so the exporter can be run against etl/screener_stub.py offline.
+
 Credentials are read from (in order of priority):
   1. Environment variables: SCREENER_USERNAME, SCREENER_PASSWORD
   2. config.local.ini [credentials] username / password
@@ -13,22 +29,33 @@ Run:
 """
 
 import configparser
+import json
 import os
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from io import StringIO
 from pathlib import Path
 
-import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 # Make root-level config importable from this subfolder
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from config import DOWNLOAD_DIR, ensure_directories_exist  # noqa: E402
+from config import (  # noqa: E402
+    DOWNLOAD_DIR,
+    SCREENER_BASE_URL,
+    SCREENER_SESSION_FILE,
+    ensure_directories_exist,
+)
+from rate_limit import TokenBucket  # noqa: E402
 
-BASE_URL = "https://www.screener.in"
+BASE_URL = SCREENER_BASE_URL
+
+EXPORT_WORKERS = 3            # screens fetched at once
+MIN_REQUEST_INTERVAL = 0.5    # seconds between any two requests, across all workers
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 SCREENS = [
     {"title": "52WeekHigh5%",          "id": "2702802", "slug": "52weekhigh5",           "folder": "52weekhigh"},
@@ -59,8 +86,11 @@ def load_credentials() -> tuple[str, str]:
     return username, password
 
 
-def _make_session() -> requests.Session:
+def _make_session(pool_size: int = EXPORT_WORKERS) -> requests.Session:
     session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     session.headers.update({
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
         "Referer": BASE_URL,
@@ -87,8 +117,89 @@ def login(session: requests.Session, username: str, password: str) -> None:
     print("Login successful.")
 
 
-def fetch_screen_csv(session: requests.Session, screen_id: str, slug: str) -> pd.DataFrame:
+def save_session(session: requests.Session, username: str, path: Path = SCREENER_SESSION_FILE) -> None:
+    """Write the session cookies to path, readable by the owner only."""
+    cookies = [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path,
+         "expires": c.expires, "secure": c.secure}
+        for c in session.cookies
+    ]
+    tmp = path.with_suffix(".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"username": username, "cookies": cookies}, f)
+    os.chmod(tmp, 0o600)
+    os.replace(tmp, path)
+
+
+def load_session(session: requests.Session, username: str, path: Path = SCREENER_SESSION_FILE) -> bool:
+    """Load saved cookies for username into session.
+
+    Returns False when there is no usable cache: missing or unreadable
+    file, another account, or an expired sessionid cookie.
+    """
+    try:
+        saved = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if saved.get("username") != username:
+        return False
+    now = time.time()
+    cookies = [c for c in saved.get("cookies", []) if not c.get("expires") or c["expires"] > now]
+    if not any(c["name"] == "sessionid" for c in cookies):
+        return False
+    for c in cookies:
+        session.cookies.set(
+            c["name"], c["value"], domain=c["domain"], path=c["path"],
+            expires=c.get("expires"), secure=c.get("secure", False),
+        )
+    return True
+
+
+def session_is_valid(session: requests.Session) -> bool:
+    """One GET of a login-only page: valid sessions get a 200, expired ones a redirect to /login/."""
+    try:
+        resp = session.get(f"{BASE_URL}/dash/", allow_redirects=False, timeout=15)
+    except requests.RequestException:
+        return False
+    return resp.status_code == 200
+
+
+def ensure_logged_in(
+    session: requests.Session, username: str, password: str, session_file: Path = SCREENER_SESSION_FILE
+) -> None:
+    """Reuse the saved session if the server still accepts it; otherwise log in and save it."""
+    if load_session(session, username, session_file) and session_is_valid(session):
+        print("Reusing saved login session.")
+        return
+    session.cookies.clear()
+    login(session, username, password)
+    save_session(session, username, session_file)
+
+
+def _check_csv_header(header: bytes) -> None:
+    """Reject exports that are not a Screener CSV (e.g. an HTML login page)."""
+    columns = [c.strip().strip('"') for c in header.decode("utf-8-sig", errors="replace").split(",")]
+    if "Name" not in columns:
+        raise ValueError(f"Unexpected export header: {header[:80]!r}")
+
+
+def download_screen_csv(
+    session: requests.Session,
+    screen_id: str,
+    slug: str,
+    csv_path: Path,
+    limiter: TokenBucket | None = None,
+) -> int:
+    """Stream a screen export into csv_path and return its number of data rows.
+
+    The body goes to csv_path.part in DOWNLOAD_CHUNK_SIZE pieces, the header
+    and line count are checked on the way through, and the file is renamed
+    over csv_path only once the download is complete.
+    """
     screen_page_url = f"{BASE_URL}/screens/{screen_id}/{slug}/"
+    if limiter:
+        limiter.acquire()
     page = session.get(screen_page_url, timeout=15)
     # Extract csrfmiddlewaretoken from the export form hidden input
     m = re.search(r'csrfmiddlewaretoken.*?value=["\']([^"\']+)["\']', page.text)
@@ -97,38 +208,87 @@ def fetch_screen_csv(session: requests.Session, screen_id: str, slug: str) -> pd
         f"{BASE_URL}/api/export/screen/"
         f"?url_name=screen&screen_id={screen_id}&slug_name={slug}"
     )
-    resp = session.post(
-        export_url,
-        data={"csrfmiddlewaretoken": csrf_token},
-        headers={"Referer": screen_page_url},
-        timeout=30,
-    )
-    resp.raise_for_status()
-    return pd.read_csv(StringIO(resp.text))
+    if limiter:
+        limiter.acquire()
+    tmp = csv_path.with_suffix(".csv.part")
+    try:
+        with session.post(
+            export_url,
+            data={"csrfmiddlewaretoken": csrf_token},
+            headers={"Referer": screen_page_url},
+            timeout=30,
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            header = b""
+            lines = 0
+            last = b"\n"
+            with open(tmp, "wb") as f:
+                for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    if not lines and b"\n" not in header:
+                        header += chunk
+                        if b"\n" in header:
+                            _check_csv_header(header.split(b"\n", 1)[0].rstrip(b"\r"))
+                    f.write(chunk)
+                    lines += chunk.count(b"\n")
+                    last = chunk[-1:]
+        if not header:
+            raise ValueError("Empty export")
+        if b"\n" not in header:
+            _check_csv_header(header.rstrip(b"\r"))
+        if last != b"\n":
+            lines += 1
+        os.replace(tmp, csv_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return lines - 1
+
+
+def save_screen(
+    session: requests.Session,
+    screen: dict,
+    date_str: str,
+    limiter: TokenBucket | None = None,
+    dest_root: Path = DOWNLOAD_DIR,
+) -> str:
+    """Fetch one screen into its download folder and return a one-line status."""
+    try:
+        dest = dest_root / screen["folder"]
+        dest.mkdir(parents=True, exist_ok=True)
+        csv_path = dest / f"screener_{date_str}.csv"
+        rows = download_screen_csv(session, screen["id"], screen["slug"], csv_path, limiter)
+        return f"Saved {rows} rows -> {csv_path}"
+    except Exception as exc:
+        return f"Failed: {exc}"
+
+
+def export_screens(
+    session: requests.Session, date_str: str, dest_root: Path = DOWNLOAD_DIR
+) -> list[str]:
+    """Save every screen in SCREENS concurrently; return their statuses in SCREENS order."""
+    limiter = TokenBucket(1 / MIN_REQUEST_INTERVAL)
+    with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as pool:
+        futures = [
+            pool.submit(save_screen, session, screen, date_str, limiter, dest_root) for screen in SCREENS
+        ]
+        return [future.result() for future in futures]
 
 
 def main() -> None:
     ensure_directories_exist()
     username, password = load_credentials()
     session = _make_session()
-    login(session, username, password)
+    ensure_logged_in(session, username, password)
 
     date_str = datetime.today().strftime("%Y-%m-%d")
+    started = time.monotonic()
+    for screen, status in zip(SCREENS, export_screens(session, date_str)):
+        print(f"\n{screen['title']}: {status}")
 
-    for screen in SCREENS:
-        print(f"\nFetching: {screen['title']}")
-        try:
-            df = fetch_screen_csv(session, screen["id"], screen["slug"])
-            dest = DOWNLOAD_DIR / screen["folder"]
-            dest.mkdir(parents=True, exist_ok=True)
-            csv_path = dest / f"screener_{date_str}.csv"
-            df.to_csv(csv_path, index=False, encoding="utf-8")
-            print(f"  Saved {len(df)} rows -> {csv_path}")
-        except Exception as exc:
-            print(f"  Failed: {exc}")
-        time.sleep(1)
-
-    print("\nDone.")
+    print(f"\nDone in {time.monotonic() - started:.1f}s.")
 
 
 if __name__ == "__main__":
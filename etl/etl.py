@@ -6,34 +6,87 @@ Supports incremental loading (default) and full rebuild.
 
 Run:
     python etl/etl.py                  # incremental from screener_downloads/
-    python etl/etl.py --rebuild        # wipe and reload from archive + live
+    python etl/etl.py --rebuild        # reload from archive + live, then swap in
     python etl/etl.py --source archive # load from __screener_downloads/ only
+    python etl/etl.py --rescan-schema  # re-read every CSV header, ignoring the manifest
+    python etl/etl.py --workers 4      # parse CSVs in 4 processes (opt-in; see --help)
+    python etl/etl.py --export-parquet # also rewrite the whole Parquet mirror
+    python etl/etl.py --compress-archive  # gzip plain CSVs already in the archive
+    python etl/etl.py --watch          # load, then keep polling for new CSVs
+    python etl/etl.py --profile        # also dump cProfile stats to etl.prof
+    python etl/etl.py --chunk-rows 50000  # stream each CSV in 50k-row chunks
+
+Each run logs per-file stage timings and writes a JSON summary to
+etl_stats.json.
+
+Archived CSVs are stored gzip-compressed; .csv and .csv.gz files are read
+interchangeably.
 """
 
 import argparse
+import cProfile
 import datetime
+import functools
+import gzip
+import hashlib
+import io
+import json
 import logging
 import os
+import pstats
 import shutil
 import sqlite3
 import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 import pandas as pd
 
+try:
+    import pyarrow  # noqa: F401  — pandas' Parquet engine for the columnar mirror
+except ImportError:
+    pyarrow = None
+
 # Make root-level config and db_utils importable from this subfolder
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from config import (  # noqa: E402
     ARCHIVE_DIR,
     COLUMN_ALIASES,
+    DATA_VERSION_FILE,
     DB_PATH,
     DOWNLOAD_DIR,
     ETL_JOBS,
     ETL_LOG_FILE,
+    ETL_PROF_FILE,
+    ETL_STATS_FILE,
     LOG_DATE_FORMAT,
     LOG_FORMAT,
+    PARQUET_DIR,
+    SQL_COLUMN_TYPES,
+    TABLE_COMPANIES,
+    TABLE_COMPANY_FIRST_SEEN,
+    TABLE_HIGHS,
+    TABLE_SCHEMA_MANIFEST,
+    WATCH_INTERVAL,
     ensure_directories_exist,
 )
+from db_migrations import (  # noqa: E402
+    DIMENSION_KEYS,
+    apply_migrations,
+    create_indexes,
+    drop_indexes,
+    fact_table,
+    hits_table,
+    latest_table,
+    rebuild_hits,
+    rebuild_latest,
+    refresh_fact_view,
+    refresh_weekly_stats,
+)
 # ── Logging ───────────────────────────────────────────────────────────────────
 
 log = logging.getLogger("ETL")
@@ -54,6 +107,24 @@ sqlite3.register_converter("DATE", lambda s: datetime.date.fromisoformat(s.decod
 
 JOBS = ETL_JOBS
 
+# Applied to the private database built by --rebuild. Nobody reads it until it
+# is swapped into place, so durability is traded for load speed. The journal
+# stays in memory (not OFF) so per-file rollback still works.
+BULK_LOAD_PRAGMAS = [
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",  # KiB, i.e. 256 MB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA locking_mode = EXCLUSIVE",
+]
+
+# Raw CSV headers tried, in order, for the row's market cap.
+MARKET_CAP_SOURCES = ["Market Capitalization", "market_cap", "Market cap"]
+
+# Rows per batch, and so per row group, when a Parquet partition is streamed.
+# Independent of --chunk-rows, which only sizes the CSV reads.
+PARQUET_BATCH_ROWS = 50_000
+
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -71,134 +142,924 @@ def normalize(col: str) -> str:
     )
 
 
-def get_superset_columns(folder: Path) -> set:
-    """Scan all CSVs in folder and return the union of normalised column names."""
+def _csv_stem(path: Path) -> str:
+    """Return a CSV's name without its .csv or .csv.gz suffix."""
+    name = path.name
+    return name[: -len(".csv.gz")] if name.endswith(".csv.gz") else path.stem
+
+
+def _list_csv_files(folder: Path) -> list[Path]:
+    """Return the plain and gzip-compressed CSVs in folder, ordered by name.
+
+    If a file exists in both forms, the plain one wins.
+    """
+    plain = {f.name: f for f in folder.glob("*.csv")}
+    files = list(plain.values())
+    files += [f for f in folder.glob("*.csv.gz") if f.name[:-3] not in plain]
+    return sorted(files, key=_csv_stem)
+
+
+def _open_binary(path: Path):
+    """Open a CSV for binary reading, decompressing .gz files on the fly."""
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def _read_header_columns(f: Path) -> list[str]:
+    """Return the normalised, aliased column names from one CSV header."""
+    df = pd.read_csv(f, engine="python", nrows=1)
+    cols = []
+    for col in df.columns:
+        norm = normalize(col)
+        cols.append(COLUMN_ALIASES.get(norm, norm))
+    return cols
+
+
+def get_superset_columns(
+    folder: Path, conn: sqlite3.Connection | None = None, rescan: bool = False
+) -> set:
+    """Return the union of normalised column names across all CSVs in folder.
+
+    With a connection, headers are cached in the schema manifest keyed by
+    path, size and mtime, so only new or changed files are re-read.
+    rescan=True ignores the cache and re-reads every header.
+    """
+    cached: dict[str, tuple] = {}
+    if conn is not None:
+        folder_key = str(folder.resolve()) + os.sep
+        for path, size, mtime, columns in conn.execute(
+            f"SELECT path, size, mtime, columns FROM {TABLE_SCHEMA_MANIFEST}"
+        ):
+            if path.startswith(folder_key):
+                cached[path] = (size, mtime, columns)
+
     all_cols: set = set()
-    for f in folder.glob("*.csv"):
+    seen: set = set()
+    scanned = 0
+    for f in _list_csv_files(folder):
+        key = str(f.resolve())
+        seen.add(key)
+        stat = f.stat()
+        hit = cached.get(key)
+        if not rescan and hit and hit[0] == stat.st_size and hit[1] == stat.st_mtime:
+            all_cols.update(json.loads(hit[2]))
+            continue
         try:
-            df = pd.read_csv(f, engine="python", nrows=1)
-            for col in df.columns:
-                norm = normalize(col)
-                all_cols.add(COLUMN_ALIASES.get(norm, norm))
+            cols = _read_header_columns(f)
         except Exception as exc:
             log.warning("Skipping bad file %s: %s", f.name, exc)
+            continue
+        scanned += 1
+        all_cols.update(cols)
+        if conn is not None:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {TABLE_SCHEMA_MANIFEST} (path, size, mtime, columns) "
+                "VALUES (?, ?, ?, ?)",
+                (key, stat.st_size, stat.st_mtime, json.dumps(cols)),
+            )
+
+    if conn is not None:
+        stale = [(path,) for path in cached if path not in seen]
+        conn.executemany(f"DELETE FROM {TABLE_SCHEMA_MANIFEST} WHERE path = ?", stale)
+        conn.commit()
+    log.info("Schema manifest for %s: %d header(s) read, %d cached", folder.name, scanned, len(seen) - scanned)
     return all_cols
 
 
 def evolve_table_schema(
     conn: sqlite3.Connection, df: pd.DataFrame, allowed_cols: set, table_name: str
 ) -> None:
-    """Add any new columns to the table that appear in df but not yet in the schema."""
-    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})").fetchall()}
+    """Add any new columns to the table that appear in df but not yet in the schema.
+
+    Columns are added to the physical fact table with their SQL_COLUMN_TYPES type
+    and the table's view is recreated to expose them.
+    """
+    physical = fact_table(table_name)
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({physical})").fetchall()}
+    added = False
     for col in df.columns:
         n = COLUMN_ALIASES.get(normalize(col), normalize(col))
-        if n not in allowed_cols or n in existing:
+        if n not in allowed_cols or n in existing or n in DIMENSION_KEYS:
             continue
-        dtype = "TEXT" if df[col].dtype == object else "REAL"
+        dtype = SQL_COLUMN_TYPES.get(n)
+        if dtype is None:
+            dtype = "REAL" if pd.api.types.is_numeric_dtype(df[col]) else "TEXT"
+            log.warning("[%s] %s is not in SQL_COLUMN_TYPES; typing it %s from the CSV", table_name, n, dtype)
         try:
-            conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {n} {dtype}")
+            conn.execute(f"ALTER TABLE {physical} ADD COLUMN {n} {dtype}")
+            existing.add(n)
+            added = True
             log.info("[%s] Added column: %s (%s)", table_name, n, dtype)
         except Exception as exc:
             log.error("[%s] Error adding column %s: %s", table_name, n, exc)
+    if added:
+        refresh_fact_view(conn, table_name)
     conn.commit()
 
 
+def connect(db_path: str = DB_PATH, bulk_load: bool = False) -> sqlite3.Connection:
+    """Open an ETL connection, applying bulk-load pragmas for rebuilds."""
+    conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+    if bulk_load:
+        for pragma in BULK_LOAD_PRAGMAS:
+            conn.execute(pragma)
+    return conn
+
+
+# ── Instrumentation ───────────────────────────────────────────────────────────
+
+# Stages of loading one CSV, in order. read/normalize run in the worker
+# processes under --workers, so per-job sums of those can exceed wall time.
+STAGES = ("read", "normalize", "schema", "first_seen", "insert", "derived", "commit")
+
+
+def _rate(rows: int, seconds: float) -> float:
+    return rows / seconds if seconds > 0 else 0.0
+
+
+@dataclass
+class FileTiming:
+    """Wall time per stage for one loaded CSV."""
+
+    table: str
+    file: str
+    bytes_read: int = 0
+    rows: int = 0
+    seconds: dict = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+    def describe(self) -> str:
+        stages = " ".join(f"{name}={secs * 1000:.0f}ms" for name, secs in self.seconds.items())
+        return f"{stages} | {_rate(self.rows, self.total):,.0f} rows/s, {self.bytes_read / 1024:,.0f} KiB"
+
+
+@dataclass
+class RunStats:
+    """Collects FileTimings across jobs and summarises them at the end of a run."""
+
+    files: list = field(default_factory=list)
+    phases: dict = field(default_factory=dict)  # run-level steps, e.g. the rebuild swap
+    started: float = field(default_factory=time.perf_counter)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def job_totals(self) -> dict:
+        jobs: dict = {}
+        for f in self.files:
+            job = jobs.setdefault(
+                f.table, {"files": 0, "rows": 0, "bytes_read": 0, "seconds": dict.fromkeys(STAGES, 0.0)}
+            )
+            job["files"] += 1
+            job["rows"] += f.rows
+            job["bytes_read"] += f.bytes_read
+            for name, secs in f.seconds.items():
+                job["seconds"][name] += secs
+        for job in jobs.values():
+            job["total_seconds"] = sum(job["seconds"].values())
+            job["rows_per_sec"] = _rate(job["rows"], job["total_seconds"])
+        return jobs
+
+    def write_summary(self, path: str = ETL_STATS_FILE) -> dict:
+        """Log one line per job and write the full summary to path as JSON."""
+        jobs = self.job_totals()
+        for table, job in jobs.items():
+            slowest = max(job["seconds"], key=job["seconds"].get)
+            log.info(
+                "[%s] %d file(s), %d rows, %.1f MiB in %.2fs (%.0f rows/s) | slowest stage: %s %.2fs",
+                table, job["files"], job["rows"], job["bytes_read"] / 2**20, job["total_seconds"],
+                job["rows_per_sec"], slowest, job["seconds"][slowest],
+            )
+        summary = {
+            "finished_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "wall_seconds": time.perf_counter() - self.started,
+            "phases": self.phases,
+            "jobs": jobs,
+            "files": [asdict(f) for f in self.files],
+        }
+        tmp = Path(f"{path}.tmp")
+        tmp.write_text(json.dumps(summary, indent=2))
+        os.replace(tmp, path)
+        log.info("Run summary written to %s", path)
+        return summary
+
+
 # ── Core ingestion ────────────────────────────────────────────────────────────
 
-def ingest_csv_folder(source_path: Path, table_name: str, processed_table: str) -> None:
-    """Load all unprocessed CSVs in source_path into table_name."""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES)
+def _column_mapping(columns: pd.Index, allowed_cols: set) -> dict[str, str]:
+    """Map DB column names to raw CSV headers for one file.
 
-    conn.execute(f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            date DATE, name TEXT, first_seen_date DATE, first_market_cap REAL
-        )
-    """)
-    conn.execute(f"""
-        CREATE TABLE IF NOT EXISTS {processed_table} (date TEXT PRIMARY KEY)
-    """)
-    conn.commit()
+    Computed once per file instead of once per row. When two headers alias to
+    the same DB column the later one wins, as the old per-row dict did.
+    """
+    mapping: dict[str, str] = {}
+    for col in columns:
+        n = COLUMN_ALIASES.get(normalize(col), normalize(col))
+        if n in allowed_cols:
+            mapping[n] = col
+    return mapping
+
+
+def _market_cap_series(df: pd.DataFrame) -> pd.Series:
+    """Return the first available market-cap column of df coerced to float."""
+    mc = pd.Series(float("nan"), index=df.index)
+    for col in MARKET_CAP_SOURCES:
+        if col in df.columns:
+            mc = mc.fillna(pd.to_numeric(df[col], errors="coerce"))
+    return mc
+
+
+def _coerce_column(column: str, values: pd.Series) -> pd.Series:
+    """Coerce one column to its SQL_COLUMN_TYPES type; unregistered columns pass through.
+
+    Numbers that do not parse become NULL, and codes parsed as floats are
+    stored as integers or as text without a trailing ".0". Columns that
+    already have the right kind of dtype are returned as is.
+    """
+    sql_type = SQL_COLUMN_TYPES.get(column)
+    if sql_type in ("REAL", "INTEGER"):
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values, errors="coerce")
+        if sql_type == "INTEGER" and not pd.api.types.is_integer_dtype(values):
+            values = values.round().astype("Int64")
+    elif sql_type == "TEXT" and not isinstance(values.dtype, pd.StringDtype):
+        if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+            values = values.astype("Int64")
+        values = values.astype("string")
+    return values
+
+
+def _prepare_frame(df: pd.DataFrame, file_date: datetime.date, allowed_cols: set) -> pd.DataFrame:
+    """Normalise one CSV into typed DB columns.
+
+    Rows without a name, or whose market cap is given but is not a number,
+    are dropped by mask; rows with no market cap at all are kept.
+    """
+    if "Name" not in df.columns:
+        return pd.DataFrame()
+
+    mc = _market_cap_series(df)
+    has_mc_col = [c for c in MARKET_CAP_SOURCES if c in df.columns]
+    raw_missing = df[has_mc_col].isna().all(axis=1) if has_mc_col else pd.Series(True, index=df.index)
+    keep = df["Name"].notna() & (mc.notna() | raw_missing)
 
-    allowed_cols = get_superset_columns(source_path)
+    kept = df.loc[keep]
+    mapping = _column_mapping(df.columns, allowed_cols)
+    out = pd.DataFrame({n: _coerce_column(n, kept[raw]) for n, raw in mapping.items()})
+    out["date"] = file_date
+    out["name"] = kept["Name"]
+    out["_mc"] = mc[keep]
+    return out.reset_index(drop=True)
 
-    for csv_file in sorted(source_path.glob("*.csv")):
-        date_str = csv_file.stem.split("_")[-1]
+
+def _lookup_first_seen(conn: sqlite3.Connection, table_name: str, names: list) -> pd.DataFrame:
+    """Return first_seen_date / first_market_cap for names already seen in table_name."""
+    rows = conn.execute(
+        f"""
+        SELECT name, first_seen_date, first_market_cap
+        FROM {TABLE_COMPANY_FIRST_SEEN}
+        WHERE table_name = ? AND name IN (SELECT value FROM json_each(?))
+        """,
+        (table_name, json.dumps([str(n) for n in names])),
+    ).fetchall()
+    return pd.DataFrame(rows, columns=["name", "first_seen_date", "first_market_cap"])
+
+
+def _upsert_first_seen(conn: sqlite3.Connection, table_name: str, frame: pd.DataFrame) -> None:
+    """Record this file's first row per name, keeping whichever first-seen date is earlier."""
+    firsts = frame.drop_duplicates(subset=["name"], keep="first")
+    conn.executemany(
+        f"""
+        INSERT INTO {TABLE_COMPANY_FIRST_SEEN} (table_name, name, first_seen_date, first_market_cap)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (table_name, name) DO UPDATE SET
+            first_seen_date = excluded.first_seen_date,
+            first_market_cap = excluded.first_market_cap
+        WHERE excluded.first_seen_date < {TABLE_COMPANY_FIRST_SEEN}.first_seen_date
+        """,
+        (
+            (table_name, str(name), date, None if pd.isna(mc) else float(mc))
+            for name, date, mc in firsts[["name", "date", "_mc"]].itertuples(index=False, name=None)
+        ),
+    )
+
+
+def _attach_first_seen(conn: sqlite3.Connection, table_name: str, frame: pd.DataFrame) -> pd.DataFrame:
+    """Fill first_seen_date / first_market_cap, defaulting new names to this file's first row.
+
+    Also records the file's sightings in the first-seen dimension.
+    """
+    known = _lookup_first_seen(conn, table_name, frame["name"].unique().tolist())
+    in_file = (
+        frame.drop_duplicates(subset=["name"], keep="first")[["name", "date", "_mc"]]
+             .rename(columns={"date": "_file_date", "_mc": "_file_mc"})
+    )
+    frame = frame.merge(known, on="name", how="left").merge(in_file, on="name", how="left")
+    _upsert_first_seen(conn, table_name, frame)
+    is_new = frame["first_seen_date"].isna()
+    frame["first_seen_date"] = frame["first_seen_date"].where(~is_new, frame["_file_date"])
+    frame["first_market_cap"] = frame["first_market_cap"].where(~is_new, frame["_file_mc"])
+    return frame.drop(columns=["_mc", "_file_date", "_file_mc"])
+
+
+def _intern(conn: sqlite3.Connection, column: str, values: pd.Series) -> pd.Series:
+    """Replace dimension values (company names, industries) by their integer keys.
+
+    Values not yet in the dimension table are added first. Missing values
+    map to missing keys.
+    """
+    dimension, key = DIMENSION_KEYS[column]
+    present = values.dropna().astype(str)
+    unique = present.unique().tolist()
+    conn.executemany(
+        f"INSERT OR IGNORE INTO {dimension} ({column}) VALUES (?)", ((v,) for v in unique)
+    )
+    ids = dict(conn.execute(
+        f"SELECT {column}, {key} FROM {dimension} WHERE {column} IN (SELECT value FROM json_each(?))",
+        (json.dumps(unique),),
+    ).fetchall())
+    return present.map(ids).reindex(values.index).astype("Int64")
+
+
+def _insert_frame(conn: sqlite3.Connection, table_name: str, frame: pd.DataFrame) -> None:
+    """Upsert frame into table_name's fact table with a single executemany.
+
+    A row for an existing (date, company) overwrites it, so a company listed
+    twice in one export, or loaded twice, never inflates the counts.
+    """
+    for column, (_, key) in DIMENSION_KEYS.items():
+        if column in frame.columns:
+            frame = frame.assign(**{column: _intern(conn, column, frame[column])})
+            frame = frame.rename(columns={column: key})
+    cols = list(frame.columns)
+    placeholders = ", ".join(["?"] * len(cols))
+    updates = ", ".join(f"{c} = excluded.{c}" for c in cols if c not in ("date", "company_id"))
+    values = frame.astype(object).where(frame.notna(), None)
+    conn.executemany(
+        f"""
+        INSERT INTO {fact_table(table_name)} ({', '.join(cols)}) VALUES ({placeholders})
+        ON CONFLICT (date, company_id) DO UPDATE SET {updates}
+        """,
+        values.itertuples(index=False, name=None),
+    )
+
+
+def _parse_csv_file(
+    csv_file: Path, file_date: datetime.date, allowed_cols: set
+) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """Read and normalise one CSV.
+
+    Returns the raw header (zero rows, with parsed dtypes) for schema evolution,
+    the normalised frame for insertion and the read/normalize stage timings.
+    Runs in worker processes under --workers, so it must not touch the database.
+    """
+    start = time.perf_counter()
+    df = pd.read_csv(csv_file, engine="python")
+    read_done = time.perf_counter()
+    df.columns = df.columns.str.strip()
+    df["date"] = file_date
+    frame = _prepare_frame(df, file_date, allowed_cols)
+    timings = {"read": read_done - start, "normalize": time.perf_counter() - read_done}
+    return df.head(0), frame, timings
+
+
+def _stream_csv_file(
+    csv_file: Path, file_date: datetime.date, allowed_cols: set, chunk_rows: int, timing: FileTiming
+) -> tuple[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """Read one CSV in chunks of chunk_rows rows with the C parser.
+
+    Returns the raw header of the first chunk for schema evolution and a
+    generator of normalised chunks, so at most one chunk is in memory at a
+    time. Read/normalize time is added to timing as the chunks are consumed.
+    """
+    reader = pd.read_csv(csv_file, engine="c", chunksize=chunk_rows)
+    with timing.stage("read"):
+        first = next(reader, None)
+    if first is None:
+        reader.close()
+        return pd.DataFrame(), iter(())
+    first.columns = first.columns.str.strip()
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        chunk = first
+        with reader:
+            while chunk is not None:
+                with timing.stage("normalize"):
+                    chunk.columns = chunk.columns.str.strip()
+                    frame = _prepare_frame(chunk, file_date, allowed_cols)
+                yield frame
+                with timing.stage("read"):
+                    chunk = next(reader, None)
+
+    return first.head(0), chunks()
+
+
+def file_content_hash(path: Path) -> str:
+    """Return the SHA-256 hex digest of a CSV, read in 1 MB blocks.
+
+    Compressed files are hashed on their decompressed content, so archiving
+    a file does not make it look changed.
+    """
+    digest = hashlib.sha256()
+    with _open_binary(path) as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class PendingFile:
+    csv_file: Path
+    date_str: str
+    file_date: datetime.date
+    content_hash: str
+    replace: bool = False  # a different version of this day is already loaded
+
+
+def _pending_files(
+    conn: sqlite3.Connection, source_path: Path, table_name: str, processed_table: str
+) -> list[PendingFile]:
+    """Return new or changed CSVs in date order.
+
+    A file whose content hash differs from the one recorded for its date is
+    returned with replace=True. Records from before hashes were tracked adopt
+    the current file's hash instead of triggering a reload.
+    """
+    pending = []
+    for csv_file in _list_csv_files(source_path):
+        date_str = _csv_stem(csv_file).split("_")[-1]
         try:
             file_date = datetime.date.fromisoformat(date_str)
         except ValueError:
             log.warning("[%s] Skipping file with invalid date: %s", table_name, csv_file.name)
             continue
 
-        if conn.execute(f"SELECT 1 FROM {processed_table} WHERE date = ?", (date_str,)).fetchone():
+        content_hash = file_content_hash(csv_file)
+        row = conn.execute(
+            f"SELECT content_hash FROM {processed_table} WHERE date = ?", (date_str,)
+        ).fetchone()
+        if row is None:
+            pending.append(PendingFile(csv_file, date_str, file_date, content_hash))
+        elif row[0] is None:
+            conn.execute(
+                f"""
+                UPDATE {processed_table}
+                SET content_hash = ?,
+                    row_count = (SELECT COUNT(*) FROM {fact_table(table_name)} WHERE date = ?)
+                WHERE date = ?
+                """,
+                (content_hash, file_date, date_str),
+            )
+            conn.commit()
+            log.info("[%s] Already processed (recorded hash): %s", table_name, csv_file.name)
+        elif row[0] == content_hash:
             log.info("[%s] Already processed: %s", table_name, csv_file.name)
-            continue
+        else:
+            log.info("[%s] Content changed, will re-ingest: %s", table_name, csv_file.name)
+            pending.append(PendingFile(csv_file, date_str, file_date, content_hash, replace=True))
+    return pending
+
+
+def _delete_day(conn: sqlite3.Connection, table_name: str, file_date: datetime.date) -> list[str]:
+    """Delete one day's rows and re-derive first-seen values that depended on them.
+
+    Returns the names whose first-seen record was rebuilt; their denormalised
+    first_* columns are refreshed by _refresh_first_seen_columns after the
+    replacement rows are inserted.
+    """
+    affected = [
+        name for (name,) in conn.execute(
+            f"SELECT name FROM {TABLE_COMPANY_FIRST_SEEN} WHERE table_name = ? AND first_seen_date = ?",
+            (table_name, file_date),
+        )
+    ]
+    conn.execute(f"DELETE FROM {fact_table(table_name)} WHERE date = ?", (file_date,))
+    if not affected:
+        return affected
+
+    names_json = json.dumps(affected)
+    conn.execute(
+        f"""
+        DELETE FROM {TABLE_COMPANY_FIRST_SEEN}
+        WHERE table_name = ? AND name IN (SELECT value FROM json_each(?))
+        """,
+        (table_name, names_json),
+    )
+    conn.execute(
+        f"""
+        INSERT INTO {TABLE_COMPANY_FIRST_SEEN} (table_name, name, first_seen_date, first_market_cap)
+        SELECT ?, name, date, market_cap FROM (
+            SELECT c.name, f.date, CAST(f.market_cap AS REAL) AS market_cap,
+                   ROW_NUMBER() OVER (PARTITION BY f.company_id ORDER BY f.date ASC, f.rowid ASC) AS rn
+            FROM {fact_table(table_name)} f
+            JOIN {TABLE_COMPANIES} c ON c.company_id = f.company_id
+            WHERE c.name IN (SELECT value FROM json_each(?))
+        ) WHERE rn = 1
+        """,
+        (table_name, names_json),
+    )
+    return affected
+
+
+def _refresh_first_seen_columns(conn: sqlite3.Connection, table_name: str, names: list) -> set[str]:
+    """Copy first-seen values from the dimension onto every fact row for names.
+
+    Returns the YYYY-MM months holding those rows, so the Parquet mirror can
+    rewrite them too.
+    """
+    physical = fact_table(table_name)
+    names_json = json.dumps([str(n) for n in names])
+    conn.execute(
+        f"""
+        UPDATE {physical}
+        SET (first_seen_date, first_market_cap) = (
+            SELECT d.first_seen_date, d.first_market_cap
+            FROM {TABLE_COMPANY_FIRST_SEEN} d
+            JOIN {TABLE_COMPANIES} c ON c.name = d.name
+            WHERE d.table_name = ? AND c.company_id = {physical}.company_id
+        )
+        WHERE company_id IN (
+            SELECT company_id FROM {TABLE_COMPANIES} WHERE name IN (SELECT value FROM json_each(?))
+        )
+        """,
+        (table_name, names_json),
+    )
+    return {
+        month for (month,) in conn.execute(
+            f"""
+            SELECT DISTINCT substr(date, 1, 7) FROM {physical}
+            WHERE company_id IN (
+                SELECT company_id FROM {TABLE_COMPANIES} WHERE name IN (SELECT value FROM json_each(?))
+            )
+            """,
+            (names_json,),
+        )
+        if month
+    }
+
+
+def _day_company_ids(
+    conn: sqlite3.Connection, table_name: str, file_date: datetime.date, replaced: bool = False
+) -> str:
+    """Return, as a JSON array, the companies whose derived rows depend on file_date.
+
+    Call after the day's rows are written and before its derived rows are
+    refreshed.
+    """
+    query, params = f"SELECT company_id FROM {fact_table(table_name)} WHERE date = ?", [file_date]
+    if replaced:
+        # Companies dropped from a replaced day still have a hits row for it.
+        query += f" UNION SELECT company_id FROM {hits_table(table_name)} WHERE date = ?"
+        params.append(file_date)
+    return json.dumps([company_id for (company_id,) in conn.execute(query, params)])
+
+
+def _refresh_hits(
+    conn: sqlite3.Connection, table_name: str, file_date: datetime.date, ids: str
+) -> None:
+    """Recompute cumulative hit counts from file_date on for the given companies.
+
+    Loading days in date order only appends one row per company; an older or
+    replaced day also renumbers that company's later rows.
+    """
+    physical, hits = fact_table(table_name), hits_table(table_name)
+    conn.execute(
+        f"DELETE FROM {hits} WHERE company_id IN (SELECT value FROM json_each(?)) AND date >= ?",
+        (ids, file_date),
+    )
+    conn.execute(
+        f"""
+        INSERT INTO {hits} (company_id, date, cum_hits)
+        SELECT f.company_id, f.date,
+               COALESCE((
+                   SELECT h.cum_hits FROM {hits} h
+                   WHERE h.company_id = f.company_id AND h.date < ?
+                   ORDER BY h.date DESC LIMIT 1
+               ), 0) + ROW_NUMBER() OVER (PARTITION BY f.company_id ORDER BY f.date)
+        FROM {physical} f
+        WHERE f.company_id IN (SELECT value FROM json_each(?)) AND f.date >= ?
+        """,
+        (file_date, ids, file_date),
+    )
 
+
+def _refresh_latest(conn: sqlite3.Connection, table_name: str, ids: str) -> None:
+    """Upsert the latest date of the given companies, dropping those with no rows left."""
+    physical, latest = fact_table(table_name), latest_table(table_name)
+    conn.execute(
+        f"""
+        INSERT INTO {latest} (company_id, date)
+        SELECT company_id, MAX(date) FROM {physical}
+        WHERE company_id IN (SELECT value FROM json_each(?))
+        GROUP BY company_id
+        ON CONFLICT (company_id) DO UPDATE SET date = excluded.date
+        """,
+        (ids,),
+    )
+    conn.execute(
+        f"""
+        DELETE FROM {latest}
+        WHERE company_id IN (SELECT value FROM json_each(?))
+          AND NOT EXISTS (SELECT 1 FROM {physical} f WHERE f.company_id = {latest}.company_id)
+        """,
+        (ids,),
+    )
+
+
+def ingest_csv_folder(
+    source_path: Path,
+    table_name: str,
+    processed_table: str,
+    rescan_schema: bool = False,
+    executor: Executor | None = None,
+    db_path: str = DB_PATH,
+    bulk_load: bool = False,
+    conn: sqlite3.Connection | None = None,
+    stats: RunStats | None = None,
+    chunk_rows: int | None = None,
+) -> int:
+    """Load all new or changed CSVs in source_path into table_name.
+
+    With an executor, CSVs are parsed in parallel but written by this single
+    connection in date order, so per-file rollback behaves as in a serial run.
+    A changed CSV replaces that day's rows in the same transaction.
+    bulk_load (used by --rebuild) skips the per-day cumulative hit counts,
+    latest dates and weekly stats; swap_rebuilt_database() derives them once
+    at the end. Pass conn to reuse an open connection (left open afterwards)
+    and stats to collect per-stage timings of every committed file.
+    With chunk_rows, each CSV is streamed into the writer in chunks of that
+    many rows (parsed in this process, so the executor is not used) and
+    still committed or rolled back as a whole; the Parquet mirror is then
+    streamed too, in its own PARQUET_BATCH_ROWS batches.
+
+    Returns the number of files committed.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(db_path, bulk_load=bulk_load)
+    apply_migrations(conn)
+
+    allowed_cols = get_superset_columns(source_path, conn, rescan=rescan_schema)
+    pending = _pending_files(conn, source_path, table_name, processed_table)
+
+    written_months: set = set()
+    loaded = 0
+    if chunk_rows:
+        results = (None for _ in pending)
+    elif executor is not None:
+        futures = [
+            executor.submit(_parse_csv_file, p.csv_file, p.file_date, allowed_cols) for p in pending
+        ]
+        results = (future.result for future in futures)
+    else:
+        results = (
+            functools.partial(_parse_csv_file, p.csv_file, p.file_date, allowed_cols) for p in pending
+        )
+
+    for item, parse in zip(pending, results):
+        csv_file, date_str = item.csv_file, item.date_str
         log.info("[%s] Processing: %s", table_name, csv_file.name)
+        timing = FileTiming(table_name, csv_file.name, bytes_read=csv_file.stat().st_size)
         try:
-            df = pd.read_csv(csv_file, engine="python")
+            if chunk_rows:
+                header, frames = _stream_csv_file(
+                    csv_file, item.file_date, allowed_cols, chunk_rows, timing
+                )
+            else:
+                header, frame, parse_seconds = parse()
+                timing.seconds.update(parse_seconds)
+                frames = [frame]
         except Exception as exc:
             log.error("[%s] Failed reading %s: %s", table_name, csv_file.name, exc)
             continue
 
-        df.columns = df.columns.str.strip()
-        df["date"] = file_date
-        evolve_table_schema(conn, df, allowed_cols, table_name)
+        with timing.stage("schema"):
+            evolve_table_schema(conn, header, allowed_cols, table_name)
 
-        failed = False
         conn.execute("BEGIN")
-        for _, row in df.iterrows():
-            name = row.get("Name")
-            if pd.isna(name):
-                continue
-
-            mc_raw = row.get("Market Capitalization") or row.get("market_cap") or row.get("Market cap")
-            try:
-                mc = float(mc_raw)
-            except (ValueError, TypeError):
-                continue
-
-            result = conn.execute(
-                f"SELECT date, CAST(market_cap AS REAL) FROM {table_name} "
-                "WHERE name = ? ORDER BY date ASC, rowid ASC LIMIT 1",
-                (name,),
-            ).fetchone()
-            first_seen_date, first_market_cap = result if result else (file_date, mc)
-
-            row_data = {}
-            for k, v in row.items():
-                n = COLUMN_ALIASES.get(normalize(k), normalize(k))
-                if n in allowed_cols:
-                    row_data[n] = v
-            row_data.update({
-                "date": file_date,
-                "name": name,
-                "first_seen_date": first_seen_date,
-                "first_market_cap": first_market_cap,
-            })
-
-            cols = ", ".join(row_data.keys())
-            placeholders = ", ".join(["?"] * len(row_data))
-            try:
-                conn.execute(f"INSERT INTO {table_name} ({cols}) VALUES ({placeholders})", list(row_data.values()))
-            except Exception as exc:
-                log.error("[%s] Error inserting %s: %s", table_name, name, exc)
-                failed = True
-                break
-
-        if failed:
+        try:
+            with timing.stage("insert"):
+                affected = _delete_day(conn, table_name, item.file_date) if item.replace else []
+            names: set = set()
+            months = {date_str[:7]}
+            for frame in frames:
+                if frame.empty:
+                    continue
+                with timing.stage("first_seen"):
+                    frame = _attach_first_seen(conn, table_name, frame)
+                with timing.stage("insert"):
+                    _insert_frame(conn, table_name, frame)
+                names.update(frame["name"])
+                timing.rows += len(frame)
+            if item.replace:
+                with timing.stage("first_seen"):
+                    months |= _refresh_first_seen_columns(conn, table_name, sorted(set(affected) | names))
+            if not bulk_load:
+                with timing.stage("derived"):
+                    ids = _day_company_ids(conn, table_name, item.file_date, replaced=item.replace)
+                    _refresh_hits(conn, table_name, item.file_date, ids)
+                    _refresh_latest(conn, table_name, ids)
+                    if table_name == TABLE_HIGHS:
+                        refresh_weekly_stats(conn, item.file_date)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {processed_table} (date, content_hash, row_count) VALUES (?, ?, ?)",
+                (date_str, item.content_hash, timing.rows),
+            )
+        except Exception as exc:
             conn.rollback()
+            log.error("[%s] Error inserting %s: %s", table_name, csv_file.name, exc)
             log.error("[%s] Rolled back — leaving unprocessed: %s", table_name, date_str)
             continue
 
-        conn.execute(f"INSERT INTO {processed_table} (date) VALUES (?)", (date_str,))
-        conn.commit()
-        log.info("[%s] Done: %s", table_name, date_str)
+        with timing.stage("commit"):
+            conn.commit()
+        loaded += 1
+        written_months |= months
+        if stats is not None:
+            stats.files.append(timing)
+        log.info(
+            "[%s] %s: %s (%d rows) | %s", table_name,
+            "Replaced" if item.replace else "Done", date_str, timing.rows, timing.describe(),
+        )
+
+    if written_months:
+        stale = _stale_parquet_months(conn, table_name) - written_months
+        if stale:
+            log.info(
+                "[%s] Parquet mirror incomplete — also rewriting %d month(s) missing or out of date",
+                table_name, len(stale),
+            )
+        write_parquet_partitions(conn, table_name, written_months | stale, stream=bool(chunk_rows))
+    if own_conn:
+        conn.close()
+    return loaded
+
+
+# ── Columnar mirror ───────────────────────────────────────────────────────────
+
+def _month_bounds(month: str) -> tuple[datetime.date, datetime.date]:
+    """Return [first day, first day of next month) for a YYYY-MM string."""
+    start = datetime.date.fromisoformat(f"{month}-01")
+    end = (start + datetime.timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def _declared_types(conn: sqlite3.Connection, table_name: str) -> dict[str, str]:
+    """Return column -> declared SQLite type for a table or view."""
+    return {col: col_type for _, col, col_type, *_ in conn.execute(f"PRAGMA table_info({table_name})")}
+
 
+def _month_row_counts(conn: sqlite3.Connection, table_name: str) -> dict[str, int]:
+    """Return YYYY-MM -> row count of table_name's fact table."""
+    return dict(conn.execute(
+        f"""
+        SELECT substr(date, 1, 7), COUNT(*)
+        FROM   {fact_table(table_name)}
+        WHERE  date IS NOT NULL
+        GROUP  BY 1
+        """
+    ))
+
+
+def _stale_parquet_months(conn: sqlite3.Connection, table_name: str) -> set[str]:
+    """Return months whose Parquet partition is missing, unreadable, extra, or
+    holds a different number of rows than the database."""
+    if pyarrow is None:
+        return set()
+    import pyarrow.parquet as pq
+
+    mirrored = {}
+    for path in (Path(PARQUET_DIR) / table_name).glob("*.parquet"):
+        try:
+            mirrored[path.stem] = pq.read_metadata(path).num_rows
+        except Exception:
+            mirrored[path.stem] = None
+    expected = _month_row_counts(conn, table_name)
+    return {month for month in expected.keys() | mirrored.keys() if expected.get(month) != mirrored.get(month)}
+
+
+def _frame_for_parquet(df: pd.DataFrame, declared: dict) -> pd.DataFrame:
+    """Give every column a single Arrow-friendly dtype.
+
+    SQLite columns can hold mixed values (e.g. numeric-looking NSE codes in a
+    TEXT column), which Arrow rejects. The declared type (column -> SQLite
+    type) decides: REAL and INTEGER columns become floats, everything else a
+    nullable string, so every month and every chunk gets the same schema
+    even when a column is entirely NULL.
+    """
+    out = df.copy()
+    for col in out.columns:
+        if col in ("date", "first_seen_date"):
+            out[col] = pd.to_datetime(out[col], errors="coerce")
+        elif declared.get(col) in ("REAL", "INTEGER"):
+            out[col] = pd.to_numeric(out[col], errors="coerce").astype("float64")
+        else:
+            out[col] = out[col].astype("string")
+    return out
+
+
+def _write_parquet_chunks(
+    conn: sqlite3.Connection, sql: str, params: tuple, declared: dict, path: Path, batch_rows: int
+) -> int:
+    """Stream a query into one Parquet file, batch_rows rows at a time.
+
+    Returns the number of rows written; no file is created for zero rows.
+    """
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in pd.read_sql(sql, conn, params=params, chunksize=batch_rows):
+            table = pyarrow.Table.from_pandas(
+                _frame_for_parquet(chunk, declared),
+                schema=writer.schema if writer is not None else None,
+                preserve_index=False,
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_parquet_partitions(
+    conn: sqlite3.Connection, table_name: str, months: set, stream: bool = False
+) -> None:
+    """Rewrite the monthly Parquet partitions of table_name for the given YYYY-MM months.
+
+    Each partition is written to a temp file and renamed into place, so
+    readers never see a half-written file. With stream, each month is read
+    from SQLite in PARQUET_BATCH_ROWS batches instead of loaded whole.
+    """
+    if pyarrow is None:
+        log.warning("[%s] pyarrow not installed — skipping Parquet mirror", table_name)
+        return
+    folder = Path(PARQUET_DIR) / table_name
+    folder.mkdir(parents=True, exist_ok=True)
+    declared = _declared_types(conn, table_name)
+    for month in sorted(months):
+        sql = f"SELECT * FROM {table_name} WHERE date >= ? AND date < ? ORDER BY date, name"
+        params = _month_bounds(month)
+        target = folder / f"{month}.parquet"
+        tmp = target.with_suffix(".parquet.tmp")
+        if stream:
+            rows = _write_parquet_chunks(conn, sql, params, declared, tmp, PARQUET_BATCH_ROWS)
+        else:
+            df = pd.read_sql(sql, conn, params=params)
+            rows = len(df)
+            if rows:
+                _frame_for_parquet(df, declared).to_parquet(tmp, index=False)
+        if not rows:
+            target.unlink(missing_ok=True)
+            continue
+        os.replace(tmp, target)
+    log.info("[%s] Parquet mirror updated: %d month(s)", table_name, len(months))
+
+
+def export_parquet_mirror(db_path: str = DB_PATH) -> None:
+    """Rewrite every monthly partition of every fact table from the database."""
+    conn = connect(db_path)
+    for job in JOBS:
+        table_name = job["table"]
+        months = set(_month_row_counts(conn, table_name)) | _stale_parquet_months(conn, table_name)
+        write_parquet_partitions(conn, table_name, months)
     conn.close()
 
 
+def gzip_csv(src: Path, dst: Path) -> None:
+    """Write a gzip copy of src to dst atomically.
+
+    The header carries no file name or timestamp, so the same CSV always
+    compresses to the same bytes and re-archiving does not churn git.
+    """
+    tmp = dst.with_name(dst.name + ".tmp")
+    with open(src, "rb") as fin, open(tmp, "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as fout:
+            shutil.copyfileobj(fin, fout, 1 << 20)
+    os.replace(tmp, dst)
+
+
 def move_to_archive(source_root: Path) -> None:
-    """Move processed CSVs from source_root into the archive directory."""
+    """Move processed CSVs from source_root into the archive directory, gzipped."""
     if source_root.resolve() == Path(ARCHIVE_DIR).resolve():
         log.info("Source is already archive — skipping move step.")
         return
@@ -210,17 +1071,158 @@ def move_to_archive(source_root: Path) -> None:
         dst.mkdir(parents=True, exist_ok=True)
         for f in src.glob("*.csv"):
             try:
-                shutil.move(str(f), str(dst / f.name))
+                gzip_csv(f, dst / f"{f.name}.gz")
+                (dst / f.name).unlink(missing_ok=True)
+                f.unlink()
                 log.info("Archived: %s", f.name)
             except Exception as exc:
                 log.error("Failed to archive %s: %s", f.name, exc)
 
 
-def rebuild_database() -> None:
-    db_file = Path(DB_PATH)
-    if db_file.exists():
-        db_file.unlink()
-        log.info("Deleted existing database: %s", db_file)
+def compress_archive() -> None:
+    """Gzip any plain CSVs left in the archive directory in place."""
+    for job in JOBS:
+        folder = Path(ARCHIVE_DIR) / job["subfolder"]
+        if not folder.exists():
+            continue
+        count = 0
+        for f in folder.glob("*.csv"):
+            try:
+                gzip_csv(f, f.with_name(f"{f.name}.gz"))
+                f.unlink()
+                count += 1
+            except Exception as exc:
+                log.error("Failed to compress %s: %s", f.name, exc)
+        log.info("[%s] Compressed %d archived CSV(s)", job["subfolder"], count)
+
+
+def rebuild_database() -> str:
+    """Start a rebuild in a fresh side database and return its path.
+
+    The live highs.db stays untouched (and readable by the app) until
+    swap_rebuilt_database() replaces it.
+    """
+    build_file = Path(DB_PATH).with_suffix(".rebuild.db")
+    for leftover in (build_file, Path(f"{build_file}-journal")):
+        if leftover.exists():
+            leftover.unlink()
+            log.info("Deleted leftover rebuild file: %s", leftover)
+    log.info("Rebuilding into: %s", build_file)
+
+    # Indexes are built once after the load instead of maintained row by row.
+    conn = connect(str(build_file), bulk_load=True)
+    apply_migrations(conn)
+    drop_indexes(conn)
+    conn.close()
+    return str(build_file)
+
+
+def swap_rebuilt_database(build_path: str, retries: int = 5) -> None:
+    """Index and analyze the rebuilt database, then atomically rename it over highs.db.
+
+    Cumulative hit counts, latest dates and weekly stats are skipped during
+    the bulk load and derived here in one pass per table.
+    """
+    conn = connect(build_path, bulk_load=True)
+    create_indexes(conn)
+    for job in JOBS:
+        rebuild_hits(conn, job["table"])
+        rebuild_latest(conn, job["table"])
+    refresh_weekly_stats(conn)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    for attempt in range(1, retries + 1):
+        try:
+            os.replace(build_path, DB_PATH)
+            log.info("Swapped rebuilt database into place: %s", DB_PATH)
+            return
+        except PermissionError as exc:
+            # Windows refuses to replace a file another process has open.
+            if attempt == retries:
+                raise
+            log.warning("Swap attempt %d failed (%s); retrying", attempt, exc)
+            time.sleep(attempt)
+
+
+# ── Watch mode ────────────────────────────────────────────────────────────────
+
+def bump_data_version() -> None:
+    """Rewrite the data-version marker so running apps drop their cached queries."""
+    tmp = Path(f"{DATA_VERSION_FILE}.tmp")
+    tmp.write_text(f"{time.time_ns()}\n")
+    os.replace(tmp, DATA_VERSION_FILE)
+
+
+def _folder_signature(folder: Path) -> tuple:
+    """Return (name, size, mtime) for each CSV in folder; changes whenever a file does."""
+    signature = []
+    for f in _list_csv_files(folder):
+        try:
+            stat = f.stat()
+        except FileNotFoundError:
+            continue
+        signature.append((f.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def watch(
+    source_root: Path,
+    interval: float,
+    executor: Executor | None = None,
+    rescan_schema: bool = False,
+    chunk_rows: int | None = None,
+) -> None:
+    """Poll source_root and load new or changed CSVs until interrupted.
+
+    A folder is loaded only once its listing has stayed the same for a full
+    poll, so exports still being written wait for the next round. One
+    connection (and the worker pool, if any) is reused across polls. A poll
+    that fails (e.g. "database is locked" while the app reads) is logged and
+    rolled back, and its folders are retried on the next poll, which also
+    archives whatever the failed poll had already loaded; only Ctrl+C stops
+    the watcher.
+    """
+    conn = connect()
+    apply_migrations(conn)
+    polled: dict[str, tuple] = {}
+    ingested: dict[str, tuple] = {}
+    log.info("Watching %s every %ss — Ctrl+C to stop", source_root, interval)
+    loaded = 0
+    stats = RunStats()
+    try:
+        while True:
+            time.sleep(interval)
+            try:
+                for job in JOBS:
+                    folder = source_root / job["subfolder"]
+                    if not folder.exists():
+                        continue
+                    signature = _folder_signature(folder)
+                    previous, polled[job["table"]] = polled.get(job["table"]), signature
+                    if signature != previous or signature == ingested.get(job["table"]):
+                        continue
+                    loaded += ingest_csv_folder(
+                        folder, job["table"], job["processed"],
+                        rescan_schema=rescan_schema, executor=executor, conn=conn, stats=stats,
+                        chunk_rows=chunk_rows,
+                    )
+                    ingested[job["table"]] = signature
+                if loaded:
+                    move_to_archive(source_root)
+                    bump_data_version()
+                    log.info("Watch: loaded %d file(s)", loaded)
+                    stats.write_summary()
+                    loaded = 0
+                    stats = RunStats()
+            except Exception:
+                log.exception("Watch: poll failed — retrying in %ss", interval)
+                conn.rollback()
+    except KeyboardInterrupt:
+        log.info("Watch stopped")
+    finally:
+        conn.close()
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
@@ -233,13 +1235,56 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--rebuild", action="store_true",
-        help="Delete highs.db and reload from archive then live.",
+        help="Rebuild highs.db from archive then live in a side file and swap it in.",
+    )
+    parser.add_argument(
+        "--rescan-schema", action="store_true",
+        help="Ignore the cached schema manifest and re-read every CSV header.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--workers", type=int, default=1, metavar="N",
+        help="Parse CSVs in N worker processes (writes stay single-threaded). "
+             "Off by default: parsing is about a quarter of a rebuild, so extra "
+             "processes rarely pay for their start-up and pickling; check "
+             "etl_stats.json before enabling it.",
+    )
+    parser.add_argument(
+        "--export-parquet", action="store_true",
+        help="Rewrite the whole Parquet mirror from highs.db after loading.",
+    )
+    parser.add_argument(
+        "--compress-archive", action="store_true",
+        help="Gzip plain CSVs already in the archive before loading.",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="After loading, keep polling the source folder and load new CSVs as they land.",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=WATCH_INTERVAL, metavar="SECONDS",
+        help=f"Seconds between polls in --watch mode (default {WATCH_INTERVAL}).",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const=ETL_PROF_FILE, default=None, metavar="PATH",
+        help="Run under cProfile and dump stats to PATH (default etl.prof). "
+             "CSV parsing in --workers processes is not profiled.",
+    )
+    parser.add_argument(
+        "--chunk-rows", type=int, default=None, metavar="N",
+        help="Stream each CSV into the database in chunks of N rows (C parser) "
+             "so memory stays flat regardless of export size.",
+    )
+    args = parser.parse_args()
+    if args.chunk_rows is not None and args.chunk_rows < 1:
+        parser.error("--chunk-rows must be a positive number of rows")
+    if args.chunk_rows and args.workers > 1:
+        parser.error("--chunk-rows streams in the writer process; drop --workers")
+    if args.watch and args.rebuild:
+        parser.error("--watch cannot be combined with --rebuild")
+    return args
 
 
-def main() -> None:
-    args = parse_args()
+def run(args: argparse.Namespace) -> None:
     ensure_directories_exist()
 
     if args.source == "archive":
@@ -250,13 +1295,21 @@ def main() -> None:
         source_roots = [Path(DOWNLOAD_DIR)]
 
     log.info("=" * 60)
-    log.info("ETL starting | sources=%s | rebuild=%s", source_roots, args.rebuild)
+    log.info(
+        "ETL starting | sources=%s | rebuild=%s | workers=%d",
+        source_roots, args.rebuild, args.workers,
+    )
     log.info("=" * 60)
 
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    stats = RunStats()
     try:
-        if args.rebuild:
-            rebuild_database()
+        if args.compress_archive:
+            with stats.phase("compress_archive"):
+                compress_archive()
+        db_path = rebuild_database() if args.rebuild else DB_PATH
 
+        loaded = 0
         for root in source_roots:
             log.info("Source root: %s", root)
             for job in JOBS:
@@ -264,8 +1317,27 @@ def main() -> None:
                 if not folder.exists():
                     log.warning("Folder not found: %s", folder)
                     continue
-                ingest_csv_folder(folder, job["table"], job["processed"])
-            move_to_archive(root)
+                loaded += ingest_csv_folder(
+                    folder, job["table"], job["processed"],
+                    rescan_schema=args.rescan_schema, executor=executor,
+                    db_path=db_path, bulk_load=args.rebuild, stats=stats,
+                    chunk_rows=args.chunk_rows,
+                )
+            with stats.phase("archive"):
+                move_to_archive(root)
+
+        if args.rebuild:
+            with stats.phase("swap"):
+                swap_rebuilt_database(db_path)
+        if args.export_parquet:
+            with stats.phase("export_parquet"):
+                export_parquet_mirror()
+        if loaded or args.rebuild or args.export_parquet:
+            bump_data_version()
+        stats.write_summary()
+
+        if args.watch:
+            watch(source_roots[0], args.interval, executor, args.rescan_schema, args.chunk_rows)
 
         log.info("=" * 60)
         log.info("ETL complete")
@@ -274,6 +1346,26 @@ def main() -> None:
     except Exception as exc:
         log.error("ETL failed: %s", exc, exc_info=True)
         sys.exit(1)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.profile:
+        run(args)
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, args)
+    finally:
+        profiler.dump_stats(args.profile)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(25)
+        log.info("cProfile stats written to %s; top functions by cumulative time:\n%s",
+                 args.profile, report.getvalue())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+"""
+prefetch_company_data.py
+
+Fills the screener_fetch disk cache (screener_cache.db) with company data
+for every NSE code in the latest highs snapshot, so the valuation pages
+read ROCE/EPS history locally instead of fetching on click.
+
+Requests go through screener_fetch's shared rate limiter. Each company is
+cached as soon as it is fetched and companies fetched within --max-age are
+skipped, so an interrupted run resumes where it stopped.
+
+Run:
+    python etl/prefetch_company_data.py
+    python etl/prefetch_company_data.py --limit 50       # largest 50 by market cap
+    python etl/prefetch_company_data.py --max-age 0      # refetch everything
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from config import DB_PATH, SCREENER_CACHE_TTL, TABLE_HIGHS  # noqa: E402
+from screener_fetch import cached_company_age, fetch_and_cache_company  # noqa: E402
+
+
+def latest_snapshot_symbols(db_path: str = DB_PATH) -> list[str]:
+    """NSE codes on the latest highs date, largest market cap first."""
+    with closing(sqlite3.connect(db_path)) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT nse_code
+            FROM   {TABLE_HIGHS}
+            WHERE  date = (SELECT MAX(date) FROM {TABLE_HIGHS})
+              AND  nse_code IS NOT NULL
+              AND  nse_code != ''
+            GROUP  BY nse_code
+            ORDER  BY MAX(market_cap) DESC
+            """
+        ).fetchall()
+    return [r[0] for r in rows]
+
+
+def prefetch(symbols: list[str], max_age: float) -> dict[str, int]:
+    """Fetch and cache every symbol whose cached entry is missing or older than max_age seconds."""
+    counts = {"fetched": 0, "fresh": 0, "failed": 0}
+    started = time.monotonic()
+    for i, symbol in enumerate(symbols, 1):
+        age = cached_company_age(symbol)
+        if age is not None and age < max_age:
+            counts["fresh"] += 1
+            continue
+        cd = fetch_and_cache_company(symbol)
+        if cd.error:
+            counts["failed"] += 1
+            print(f"  [{i}/{len(symbols)}] {symbol}: failed: {cd.error}")
+        else:
+            counts["fetched"] += 1
+            print(f"  [{i}/{len(symbols)}] {symbol}: ok")
+    print(
+        f"Prefetch done in {time.monotonic() - started:.1f}s: {counts['fetched']} fetched, "
+        f"{counts['fresh']} already fresh, {counts['failed']} failed."
+    )
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prefetch Screener.in company data into the disk cache.")
+    parser.add_argument("--db", default=DB_PATH, help="Database to read the latest highs snapshot from.")
+    parser.add_argument("--limit", type=int, default=None, help="Only the N largest companies.")
+    parser.add_argument(
+        "--max-age", type=float, default=SCREENER_CACHE_TTL / 3600,
+        help="Skip companies cached within this many hours (default: the cache TTL).",
+    )
+    args = parser.parse_args()
+
+    symbols = latest_snapshot_symbols(args.db)[: args.limit]
+    print(f"Prefetching {len(symbols)} companies from the latest {TABLE_HIGHS} snapshot...")
+    try:
+        counts = prefetch(symbols, args.max_age * 3600)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun to resume (cached companies are skipped).")
+        sys.exit(130)
+    if symbols and counts["failed"] == len(symbols):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
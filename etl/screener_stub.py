@@ -0,0 +1,327 @@
+"""
+screener_stub.py
+
+Local stand-in for the parts of Screener.in used by daily_screen_exports.py
+and screener_fetch.py: login, dashboard, screen page, screen export,
+company page and company search. Responses come from captured files under
+etl/fixtures/screener/:
+
+    company/<SYMBOL>/<variant>.html   variant = consolidated | standalone | default
+    search/<query>.json               lower-cased query
+    exports/<slug>.csv                screen export; when missing, the newest
+                                      archived CSV of that screen is served
+
+Any username/password logs in. Latency and failures can be injected to
+exercise retries and measure throughput.
+
+Run:
+    python etl/screener_stub.py                          # serve on 127.0.0.1:8765
+    python etl/screener_stub.py --latency 0.2 --error-rate 0.05
+    python etl/screener_stub.py record --symbols TCS INFY --search tata
+    SCREENER_BASE_URL=http://127.0.0.1:8765 python etl/daily_screen_exports.py
+
+GET /__stats__ returns the number of requests served per route as JSON.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from config import ARCHIVE_DIR  # noqa: E402
+from daily_screen_exports import (  # noqa: E402
+    SCREENS,
+    _make_session,
+    download_screen_csv,
+    ensure_logged_in,
+    load_credentials,
+)
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "screener"
+
+_COMPANY_RE = re.compile(r"^/company/([^/]+)/(?:(consolidated|standalone)/)?$")
+_SCREEN_RE = re.compile(r"^/screens/(\d+)/([^/]+)/$")
+
+_SCREEN_PAGE = (
+    '<html><body><form method="post" action="/api/export/screen/">'
+    '<input type="hidden" name="csrfmiddlewaretoken" value="stub-form-token">'
+    "</form></body></html>"
+)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server carrying the fixture directory, fault settings and request counts."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        fixtures: Path = FIXTURES_DIR,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(address, StubHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._sessions = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def roll(self) -> tuple[float, bool]:
+        """Return (delay, fail) for the next request."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            return delay, self._random.random() < self.error_rate
+
+    def count(self, route: str) -> None:
+        with self._lock:
+            self.counts[route] += 1
+
+    def new_session_id(self) -> str:
+        with self._lock:
+            self._sessions += 1
+            return f"stub-session-{self._sessions}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response stalls on the client's delayed ACK.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+    # ── Responses ─────────────────────────────────────────────────────────────
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "text/html; charset=utf-8",
+              headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _redirect(self, location: str, headers: dict | None = None) -> None:
+        self._send(302, headers={"Location": location, **(headers or {})})
+
+    def _logged_in(self) -> bool:
+        return "sessionid=stub-session-" in self.headers.get("Cookie", "")
+
+    def _read_body(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+    # ── Dispatch ──────────────────────────────────────────────────────────────
+
+    def do_GET(self) -> None:
+        self._dispatch()
+
+    def do_POST(self) -> None:
+        self._read_body()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/__stats__":
+            self._send(200, json.dumps(self.server.counts).encode(), "application/json")
+            return
+        route, handler = self._route(url.path)
+        self.server.count(route)
+        delay, fail = self.server.roll()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._send(503, b"Injected failure", "text/plain")
+            return
+        handler(url)
+
+    def _route(self, path: str):
+        if path == "/login/":
+            return "login", self._login
+        if path == "/dash/":
+            return "dash", self._dash
+        if path == "/api/export/screen/" and self.command == "POST":
+            return "export", self._export
+        if path == "/api/company/search/":
+            return "search", self._search
+        if _SCREEN_RE.match(path):
+            return "screen", self._screen
+        if _COMPANY_RE.match(path):
+            return "company", self._company
+        return "other", lambda url: self._send(404, b"Not found", "text/plain")
+
+    # ── Routes ────────────────────────────────────────────────────────────────
+
+    def _login(self, url) -> None:
+        if self.command == "GET":
+            self._send(200, b"<html><body>login</body></html>",
+                       headers={"Set-Cookie": "csrftoken=stub-csrf; Path=/"})
+            return
+        cookie = f"sessionid={self.server.new_session_id()}; Path=/; Max-Age=1209600; HttpOnly"
+        self._redirect("/dash/", {"Set-Cookie": cookie})
+
+    def _dash(self, url) -> None:
+        if self._logged_in():
+            self._send(200, b"<html><body>dashboard</body></html>")
+        else:
+            self._redirect("/login/?next=/dash/")
+
+    def _screen(self, url) -> None:
+        self._send(200, _SCREEN_PAGE.encode())
+
+    def _export(self, url) -> None:
+        if not self._logged_in():
+            self._redirect("/login/?next=/dash/")
+            return
+        slug = parse_qs(url.query).get("slug_name", [""])[0]
+        body = export_fixture(self.server.fixtures, slug)
+        if body is None:
+            self._send(404, b"Unknown screen", "text/plain")
+        else:
+            self._send(200, body, "text/csv; charset=utf-8")
+
+    def _company(self, url) -> None:
+        symbol, variant = _COMPANY_RE.match(url.path).groups()
+        folder = self.server.fixtures / "company" / symbol.upper()
+        # A company recorded without a consolidated page 404s there, like the
+        # live site, and the plain /company/<SYMBOL>/ URL serves what exists.
+        if variant:
+            names = [f"{variant}.html", "default.html"]
+        else:
+            names = ["default.html", "standalone.html", "consolidated.html"]
+        page = next((folder / n for n in names if (folder / n).exists()), None)
+        if page is not None:
+            self._send(200, page.read_bytes())
+        else:
+            self._send(404, b"Not found", "text/plain")
+
+    def _search(self, url) -> None:
+        query = parse_qs(url.query).get("q", [""])[0].strip().lower()
+        path = self.server.fixtures / "search" / f"{query}.json"
+        body = path.read_bytes() if query and path.exists() else b"[]"
+        self._send(200, body, "application/json")
+
+
+def export_fixture(fixtures: Path, slug: str) -> bytes | None:
+    """Bytes of the export fixture for slug, else the newest archived CSV of that screen."""
+    path = fixtures / "exports" / f"{slug}.csv"
+    if path.exists():
+        return path.read_bytes()
+    folder = next((s["folder"] for s in SCREENS if s["slug"] == slug), None)
+    if folder is None:
+        return None
+    archived = sorted(
+        (Path(ARCHIVE_DIR) / folder).glob("screener_*.csv*"), key=lambda p: p.name.split(".")[0]
+    )
+    if not archived:
+        return None
+    newest = archived[-1]
+    return gzip.decompress(newest.read_bytes()) if newest.suffix == ".gz" else newest.read_bytes()
+
+
+def start_server(
+    host: str = "127.0.0.1", port: int = 0, **options
+) -> StubServer:
+    """Start a StubServer on a background thread (port 0 picks a free port)."""
+    server = StubServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="screener-stub", daemon=True).start()
+    return server
+
+
+# ── Recording ─────────────────────────────────────────────────────────────────
+
+def record(symbols: list[str], queries: list[str], screens: bool, fixtures: Path = FIXTURES_DIR) -> None:
+    """Capture company pages, search results and (with screens) exports from SCREENER_BASE_URL."""
+    import screener_fetch  # needs bs4, which serving does not
+
+    for symbol in symbols:
+        for variant in ("consolidated", "standalone"):
+            resp = screener_fetch._throttled_get(f"{screener_fetch.BASE_URL}/company/{symbol}/{variant}/")
+            if resp.status_code == 404:
+                continue
+            resp.raise_for_status()
+            path = fixtures / "company" / symbol.upper() / f"{variant}.html"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(resp.content)
+            print(f"Recorded {path}")
+    for query in queries:
+        resp = screener_fetch._throttled_get(
+            f"{screener_fetch.BASE_URL}/api/company/search/?q={screener_fetch.requests.utils.quote(query)}"
+        )
+        resp.raise_for_status()
+        path = fixtures / "search" / f"{query.lower()}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(resp.content)
+        print(f"Recorded {path}")
+    if screens:
+        session = _make_session()
+        ensure_logged_in(session, *load_credentials())
+        (fixtures / "exports").mkdir(parents=True, exist_ok=True)
+        for screen in SCREENS:
+            path = fixtures / "exports" / f"{screen['slug']}.csv"
+            rows = download_screen_csv(session, screen["id"], screen["slug"], path)
+            print(f"Recorded {path} ({rows} rows)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve or record Screener.in fixtures.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, up to this many seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for jitter and injected errors.")
+    sub = parser.add_subparsers(dest="command")
+    rec = sub.add_parser("record", help="Capture fixtures from SCREENER_BASE_URL (the live site by default).")
+    rec.add_argument("--symbols", nargs="*", default=[], help="Company symbols to capture.")
+    rec.add_argument("--search", nargs="*", default=[], help="Search queries to capture.")
+    rec.add_argument("--screens", action="store_true", help="Also capture the screen exports (needs login).")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.symbols, args.search, args.screens, args.fixtures)
+        return
+
+    server = StubServer(
+        (args.host, args.port), fixtures=args.fixtures, latency=args.latency,
+        jitter=args.jitter, error_rate=args.error_rate, seed=args.seed,
+    )
+    print(f"Serving {args.fixtures} on {server.base_url}")
+    print(f"  SCREENER_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+rate_limit.py — request throttling shared by the Screener.in clients.
+
+screener_fetch.py (app lookups) and etl/daily_screen_exports.py (screen
+exports) both pace their requests with TokenBucket: rate requests/second
+with bursts of up to burst requests. burst=1 spaces every request 1/rate
+seconds apart.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens/second, holding at most burst.
+
+    acquire() reserves a token under the lock and sleeps outside it, so
+    waiting threads are released in order, 1/rate seconds apart. A rate of
+    0 or less disables throttling.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,100 @@
+"""
+screener_cache.py — persistent cache for screener_fetch results.
+
+Entries live in their own SQLite file (SCREENER_CACHE_DB), separate from
+highs.db so the ETL's rebuild/swap never touches them. Each entry is keyed
+by (kind, key) — e.g. ("company", "TCS:consolidated") or ("search", "tata") —
+and stores a JSON value with the time it was fetched and last read. Once
+the cache holds more than max_entries rows, writes evict the least
+recently read ones.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from config import SCREENER_CACHE_DB, SCREENER_CACHE_MAX_ENTRIES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS screener_cache (
+    kind        TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    fetched_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_screener_cache_accessed ON screener_cache(accessed_at);
+"""
+
+
+class ScreenerCache:
+    """Size-bounded LRU store of JSON values in a SQLite file, safe to share across threads."""
+
+    def __init__(self, path: str = SCREENER_CACHE_DB, max_entries: int = SCREENER_CACHE_MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._ready = True
+        return conn
+
+    def get(self, kind: str, key: str) -> tuple[object, float] | None:
+        """Return (value, age in seconds) and mark the entry as read, or None if absent."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, fetched_at FROM screener_cache WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE screener_cache SET accessed_at = ? WHERE kind = ? AND key = ?", (now, kind, key)
+            )
+        return json.loads(row[0]), now - row[1]
+
+    def age(self, kind: str, key: str) -> float | None:
+        """Seconds since the entry was fetched, without counting as a read; None if absent."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM screener_cache WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+        return None if row is None else time.time() - row[0]
+
+    def put(self, kind: str, key: str, value: object) -> None:
+        """Store value as freshly fetched, evicting least recently read entries beyond max_entries."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO screener_cache (kind, key, value, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, key) DO UPDATE SET
+                    value = excluded.value,
+                    fetched_at = excluded.fetched_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (kind, key, json.dumps(value), now, now),
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM screener_cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    """
+                    DELETE FROM screener_cache WHERE (kind, key) IN (
+                        SELECT kind, key FROM screener_cache ORDER BY accessed_at LIMIT ?
+                    )
+                    """,
+                    (excess,),
+                )
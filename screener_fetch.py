@@ -1,27 +1,46 @@
 """
 screener_fetch.py — fetch public company data from screener.in (no login required).
 
-Rate-limited to 1 request/second to be a polite client.
-Results are cached in-process so repeated calls for the same symbol are free.
+Requests share one keep-alive session and a token bucket (rate_limit.py;
+SCREENER_FETCH_RATE requests/second, bursts of SCREENER_FETCH_BURST), so
+concurrent app sessions stay polite in aggregate.
+Results are cached on disk (screener_cache.py) so repeat loads survive app
+restarts: entries younger than SCREENER_CACHE_TTL are served as is, older
+ones are served while a background thread refreshes them, and entries past
+SCREENER_CACHE_MAX_STALE are refetched first.
+Requests go to SCREENER_BASE_URL (see config.py).
 
 Public API:
-  search_companies(query)              -> list[dict]
+  search_companies(query)              -> tuple[dict, ...]
   fetch_company_data(symbol, ...)      -> CompanyData
+  fetch_and_cache_company(symbol, ...) -> CompanyData   (always hits the network)
+  cached_company_age(symbol, ...)      -> seconds since cached, or None
 """
 
 from __future__ import annotations
 
 import re
-import time
-from dataclasses import dataclass, field
-from functools import lru_cache
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
-BASE_URL = "https://www.screener.in"
-_MIN_INTERVAL = 1.0  # seconds between requests
-_last_request_time: float = 0.0
+from config import (
+    SCREENER_BASE_URL,
+    SCREENER_CACHE_MAX_STALE,
+    SCREENER_CACHE_TTL,
+    SCREENER_FETCH_BURST,
+    SCREENER_FETCH_RATE,
+)
+from rate_limit import TokenBucket
+from screener_cache import ScreenerCache
+
+BASE_URL = SCREENER_BASE_URL
+_POOL_SIZE = 4  # keep-alive connections kept open to Screener.in
 
 _HEADERS = {
     "User-Agent": (
@@ -33,15 +52,23 @@ _HEADERS = {
 }
 
 
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(_HEADERS)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_limiter = TokenBucket(SCREENER_FETCH_RATE, SCREENER_FETCH_BURST)
+_session = _make_session()
+
+
 def _throttled_get(url: str, timeout: int = 15) -> requests.Response:
-    """GET with a 1 req/s rate limit."""
-    global _last_request_time
-    elapsed = time.monotonic() - _last_request_time
-    if elapsed < _MIN_INTERVAL:
-        time.sleep(_MIN_INTERVAL - elapsed)
-    resp = requests.get(url, headers=_HEADERS, timeout=timeout)
-    _last_request_time = time.monotonic()
-    return resp
+    """GET through the shared session once the shared token bucket allows it."""
+    _limiter.acquire()
+    return _session.get(url, timeout=timeout)
 
 
 @dataclass
@@ -62,9 +89,67 @@ class CompanyData:
     error: str | None = None
 
 
-@lru_cache(maxsize=64)
+_cache = ScreenerCache()
+_refresh_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screener-refresh")
+_refreshing: set[tuple[str, str]] = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh_in_background(entry: tuple[str, str], refresh: Callable[[], object]) -> None:
+    """Queue refresh() once per cache entry, however many readers hit it while stale."""
+    with _refreshing_lock:
+        if entry in _refreshing:
+            return
+        _refreshing.add(entry)
+
+    def run() -> None:
+        try:
+            refresh()
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(entry)
+
+    _refresh_pool.submit(run)
+
+
+def _cache_lookup(kind: str, key: str, refresh: Callable[[], object]) -> tuple[object | None, bool]:
+    """Return (cached value or None, whether it can be served without fetching first).
+
+    Stale entries within SCREENER_CACHE_MAX_STALE are servable and queue
+    refresh(); older ones are returned unservable so the caller refetches
+    now but can fall back to them if that fetch fails.
+    """
+    hit = _cache.get(kind, key)
+    if hit is None:
+        return None, False
+    value, age = hit
+    if age >= SCREENER_CACHE_MAX_STALE:
+        return value, False
+    if age >= SCREENER_CACHE_TTL:
+        _refresh_in_background((kind, key), refresh)
+    return value, True
+
+
+def _search_and_cache(query: str) -> tuple[dict, ...]:
+    results = _search_companies(query)
+    if not results or "error" not in results[0]:
+        _cache.put("search", query.strip().lower(), list(results))
+    return results
+
+
 def search_companies(query: str) -> tuple[dict, ...]:
-    """Return cached tuple of {id, name, symbol, url} dicts matching query."""
+    """Return a tuple of {id, name, symbol, url} dicts matching query, cached on disk."""
+    cached, servable = _cache_lookup("search", query.strip().lower(), lambda: _search_and_cache(query))
+    if servable:
+        return tuple(cached)
+    results = _search_and_cache(query)
+    if results and "error" in results[0] and cached is not None:
+        return tuple(cached)
+    return results
+
+
+def _search_companies(query: str) -> tuple[dict, ...]:
+    """Search Screener.in (uncached); errors come back as a single {"error": ...} dict."""
     url = f"{BASE_URL}/api/company/search/?q={requests.utils.quote(query)}"
     try:
         resp = _throttled_get(url)
@@ -160,9 +245,46 @@ def _eps_cagr(history: dict[str, float]) -> float | None:
     return round(cagr * 100, 1)
 
 
-@lru_cache(maxsize=64)
+_COMPANY_FIELDS = {f.name for f in fields(CompanyData)}
+
+
+def company_cache_key(symbol: str, consolidated: bool = True) -> str:
+    return f"{symbol.upper()}:{'consolidated' if consolidated else 'standalone'}"
+
+
+def _company_from_cache(value: dict) -> CompanyData:
+    return CompanyData(**{k: v for k, v in value.items() if k in _COMPANY_FIELDS})
+
+
+def fetch_and_cache_company(symbol: str, consolidated: bool = True) -> CompanyData:
+    """Fetch company data from Screener.in now and store it in the disk cache unless it failed."""
+    cd = _fetch_company_data(symbol, consolidated)
+    if cd.error is None:
+        _cache.put("company", company_cache_key(symbol, consolidated), asdict(cd))
+    return cd
+
+
+def cached_company_age(symbol: str, consolidated: bool = True) -> float | None:
+    """Seconds since symbol was last fetched into the disk cache, or None if it is not cached."""
+    return _cache.age("company", company_cache_key(symbol, consolidated))
+
+
 def fetch_company_data(symbol: str, consolidated: bool = True) -> CompanyData:
-    """Fetch and parse company data. Results are cached for the process lifetime."""
+    """Return parsed company data, from the disk cache when it is recent enough."""
+    cached, servable = _cache_lookup(
+        "company", company_cache_key(symbol, consolidated),
+        lambda: fetch_and_cache_company(symbol, consolidated),
+    )
+    if servable:
+        return _company_from_cache(cached)
+    cd = fetch_and_cache_company(symbol, consolidated)
+    if cd.error is not None and cached is not None:
+        return _company_from_cache(cached)
+    return cd
+
+
+def _fetch_company_data(symbol: str, consolidated: bool = True) -> CompanyData:
+    """Fetch and parse company data from Screener.in (uncached)."""
     variant = "consolidated" if consolidated else "standalone"
     url = f"{BASE_URL}/company/{symbol}/{variant}/"
     cd = CompanyData(symbol=symbol, name=symbol)
@@ -1,9 +1,12 @@
 import importlib
 
 import streamlit as st
+from db_utils import ensure_schema, sync_data_version
 from mcap_tier_utils import render_global_mcap_focus_sidebar
 
 st.set_page_config(page_title="52-Week High Tracker", layout="wide")
+ensure_schema()
+sync_data_version()
 
 PAGE_OPTIONS = {
     "Start Here": "start_here_view",
@@ -120,15 +120,9 @@ def compute_mcap_change(df):
     return df
 
 
-def load_first_caps(get_historical_market_cap):
-    hist_df = get_historical_market_cap()
-    hist_df["date"] = pd.to_datetime(hist_df["date"])
-    return (
-        hist_df.sort_values(["name", "date"])
-        .groupby("name", as_index=False)
-        .first()[["name", "market_cap", "date"]]
-        .rename(columns={"market_cap": "first_market_cap", "date": "first_seen_date"})
-    )
+def load_first_caps(get_company_first_seen):
+    first_caps = get_company_first_seen()
+    return first_caps[["name", "first_market_cap", "first_seen_date"]]
 
 
 def style_display_df(display_df):
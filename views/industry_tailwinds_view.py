@@ -71,7 +71,7 @@ def main():
     # Total stocks per industry (all time) — used for breadth %
     all_df = get_momentum_summary()
     total_per_industry = (
-        all_df.groupby("industry")["name"].count().rename("total_stocks").reset_index()
+        all_df.groupby("industry", observed=True)["name"].count().rename("total_stocks").reset_index()
         if not all_df.empty else pd.DataFrame(columns=["industry", "total_stocks"])
     )
 
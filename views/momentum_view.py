@@ -44,7 +44,7 @@ def _weekly_summary(df, start, end):
     week_df = df.loc[mask].copy()
     if week_df.empty:
         return pd.DataFrame()
-    summary = week_df.groupby("name").agg(
+    summary = week_df.groupby("name", observed=True).agg(
         hits=("date", "count"),
         market_cap_start=("market_cap", "first"),
         market_cap_end=("market_cap", "last"),
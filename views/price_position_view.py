@@ -7,12 +7,12 @@ from dateutil.relativedelta import relativedelta
 
 from db_utils import (
     get_all_dates,
+    get_company_first_seen,
     get_data_for_date,
     get_downfromhigh_data_for_date,
     get_downfromhigh_dates,
     get_fivetofiftyclub_data_for_date,
     get_fivetofiftyclub_dates,
-    get_historical_market_cap,
 )
 from grid_utils import render_interactive_table
 from mcap_tier_utils import add_mcap_tier_col, apply_mcap_tier_filter, get_global_mcap_focus
@@ -156,26 +156,15 @@ def _load_data(bucket_cfg: dict) -> pd.DataFrame:
         all_df = pd.concat(dfs, ignore_index=True)
         all_df["date"] = pd.to_datetime(all_df["date"]).dt.date
 
-        first_caps = (
-            all_df.sort_values(["name", "date"])
-                  .groupby("name", as_index=False)
-                  .first()[["name", "market_cap", "date"]]
-                  .rename(columns={"market_cap": "first_market_cap", "date": "first_seen_date"})
-        )
-        last_caps = (
+        df = (
             all_df.sort_values(["name", "date"])
                   .groupby("name", as_index=False)
                   .last()
-                  .drop(columns=["first_seen_date", "first_market_cap"], errors="ignore")
         )
-        df = last_caps.merge(first_caps, on="name", how="left")
-        for col in ["date", "first_seen_date"]:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col]).dt.date
         date_info = "All Dates"
 
     # Attach first-seen caps and compute Δ% MCap
-    first_caps = load_first_caps(get_historical_market_cap)
+    first_caps = load_first_caps(get_company_first_seen)
     df = df.drop(columns=["first_market_cap", "first_seen_date"], errors="ignore")
     df = df.merge(first_caps, on="name", how="left")
     for col in ["date", "first_seen_date"]:
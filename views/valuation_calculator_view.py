@@ -157,7 +157,7 @@ def _render_company_picker(all_companies: pd.DataFrame) -> pd.Series | None:
             st.sidebar.caption("Type a name or symbol to search Screener.in.")
             return None
 
-        results = search_companies(query)  # lru_cached
+        results = search_companies(query)  # cached on disk
         if not results or "error" in results[0]:
             err = results[0].get("error", "No results") if results else "No results"
             st.sidebar.warning(f"Search failed: {err}")
@@ -6,6 +6,7 @@ import streamlit as st
 from db_utils import (
     compute_industry_tailwind_stats,
     get_momentum_summary,
+    get_weekly_periods,
     get_weekly_report_snapshot,
 )
 from grid_utils import render_interactive_table
@@ -439,11 +440,30 @@ def _render_company_table(
     )
 
 
+def _select_weeks() -> tuple:
+    """Sidebar picker for the two weeks to compare; (None, None) keeps the default report."""
+    weeks = get_weekly_periods()
+    if weeks.empty:
+        return None, None
+
+    st.sidebar.subheader("Report Weeks")
+    latest_label = "Latest completed week"
+    week_starts = [ts.date() for ts in weeks["week_start"].sort_values(ascending=False)]
+    report_week = st.sidebar.selectbox("Report week", [latest_label, *week_starts], key="wr_report_week")
+    if report_week == latest_label:
+        return None, None
+
+    earlier = [week for week in week_starts if week < report_week]
+    compare_week = st.sidebar.selectbox("Compare with", earlier, key="wr_compare_week") if earlier else None
+    return report_week, compare_week
+
+
 def main() -> None:
     st.title("Weekly Report")
     st.markdown("A concise week-over-week summary so you can see the market story without reading every table.")
 
-    snapshot = get_weekly_report_snapshot()
+    report_week, compare_week = _select_weeks()
+    snapshot = get_weekly_report_snapshot(report_week, compare_week)
     if not snapshot:
         st.warning("Not enough weekly data is available to build the report yet.")
         return